@@ -13,6 +13,9 @@ from __future__ import print_function
 from __future__ import division
 import os
 import re
+import json
+import time
+import uuid
 import socket
 import logging
 import importlib
@@ -23,12 +26,9 @@ from signac.common import six
 from signac.common.six import with_metaclass
 
 from .scheduling.base import JobStatus
-from .scheduling.lsf import LSFScheduler
-from .scheduling.slurm import SlurmScheduler
-from .scheduling.torque import TorqueScheduler
-from .scheduling.simple_scheduler import SimpleScheduler
-from .scheduling.fakescheduler import FakeScheduler
 from .util import config as flow_config
+from .util.misc import _mkdir_p
+from .util.store import _replace
 from .errors import NoSchedulerError
 
 if six.PY2:
@@ -44,6 +44,42 @@ if six.PY2:
 # Global variable can be used to override detected environment
 ENVIRONMENT = None
 
+# Environments detected by their hostname pattern are cached per host within this file;
+# set to None to disable the cache.
+ENVIRONMENT_CACHE = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'signac-flow', 'environment.json')
+
+# Cached environments are detected again after this many seconds.
+ENVIRONMENT_CACHE_TTL = 24 * 3600
+
+# The fully qualified domain name of this host, see _get_fqdn().
+_FQDN = None
+
+
+def _get_fqdn():
+    "Return the fully qualified domain name of this host, which is only resolved once."
+    global _FQDN
+    if _FQDN is None:
+        _FQDN = socket.getfqdn()
+    return _FQDN
+
+
+class _LazySchedulerType(object):
+    """Refer to a scheduler driver, which is only imported on first access.
+
+    Accessing the attribute on an environment class or instance returns
+    the scheduler class itself.
+    """
+
+    def __init__(self, module, name):
+        self._module = module
+        self._name = name
+
+    def __get__(self, instance, owner):
+        module = importlib.import_module(self._module, __package__)
+        return getattr(module, self._name)
+
 
 def setup(py_modules, **attrs):
     """Setup function for environment modules.
@@ -128,7 +164,7 @@ class ComputeEnvironment(with_metaclass(ComputeEnvironmentType)):
                 return cls.scheduler_type.is_present()
         else:
             return re.match(
-                cls.hostname_pattern, socket.getfqdn()) is not None
+                cls.hostname_pattern, _get_fqdn()) is not None
 
     @classmethod
     def get_scheduler(cls):
@@ -228,30 +264,30 @@ class TestEnvironment(ComputeEnvironment):
     the job submission script generation in environments without
     a real scheduler.
     """
-    scheduler_type = FakeScheduler
+    scheduler_type = _LazySchedulerType('.scheduling.fakescheduler', 'FakeScheduler')
 
 
 class SimpleSchedulerEnvironment(ComputeEnvironment):
     "An environment for the simple-scheduler scheduler."
-    scheduler_type = SimpleScheduler
+    scheduler_type = _LazySchedulerType('.scheduling.simple_scheduler', 'SimpleScheduler')
     template = 'simple_scheduler.sh'
 
 
 class TorqueEnvironment(ComputeEnvironment):
     "An environment with TORQUE scheduler."
-    scheduler_type = TorqueScheduler
+    scheduler_type = _LazySchedulerType('.scheduling.torque', 'TorqueScheduler')
     template = 'torque.sh'
 
 
 class SlurmEnvironment(ComputeEnvironment):
     "An environment with SLURM scheduler."
-    scheduler_type = SlurmScheduler
+    scheduler_type = _LazySchedulerType('.scheduling.slurm', 'SlurmScheduler')
     template = 'slurm.sh'
 
 
 class LSFEnvironment(ComputeEnvironment):
     "An environment with LSF scheduler."
-    scheduler_type = LSFScheduler
+    scheduler_type = _LazySchedulerType('.scheduling.lsf', 'LSFScheduler')
     template = 'lsf.sh'
 
 
@@ -366,6 +402,82 @@ def _import_configured_environments():
         pass
 
 
+def _is_detected_by_hostname(env_type):
+    "Return True if env_type is detected by its hostname pattern only."
+    return env_type.hostname_pattern is not None and \
+        env_type.is_present.__func__ is ComputeEnvironment.is_present.__func__
+
+
+def _detect_environment(env_types):
+    """Return the last of env_types that is present or the StandardEnvironment.
+
+    Environments that are detected by their hostname pattern are checked first,
+    such that the schedulers are only probed if no hostname pattern matches.
+    """
+    by_hostname = [env_type for env_type in env_types if _is_detected_by_hostname(env_type)]
+    others = [env_type for env_type in env_types if not _is_detected_by_hostname(env_type)]
+    for env_type in reversed(by_hostname):
+        if env_type.is_present():
+            logger.debug("Select environment '{}'; hostname matches.".format(env_type.__name__))
+            return env_type
+    for env_type in reversed(others):
+        if env_type.is_present():
+            logger.debug("Select environment '{}'; is present.".format(env_type.__name__))
+            return env_type
+    return StandardEnvironment
+
+
+def _load_environment_cache():
+    "Return the environment cache, a mapping of hostnames to cached environments."
+    try:
+        with open(ENVIRONMENT_CACHE) as file:
+            cache = json.load(file)
+    except (IOError, OSError, ValueError):
+        return dict()
+    return cache if isinstance(cache, dict) else dict()
+
+
+def _get_cached_environment(env_types):
+    """Return the environment that was previously detected on this host or None.
+
+    A cached environment is only valid if it was detected within the last
+    ENVIRONMENT_CACHE_TTL seconds with the same registered environments and
+    if it is detected by its hostname pattern.
+    """
+    entry = _load_environment_cache().get(socket.gethostname())
+    try:
+        if entry['registry'] != [env_type.__name__ for env_type in env_types]:
+            return None
+        if time.time() - entry['time'] >= ENVIRONMENT_CACHE_TTL:
+            return None
+        name = entry['environment']
+    except (KeyError, TypeError):
+        return None
+    for env_type in env_types:
+        if env_type.__name__ == name and _is_detected_by_hostname(env_type):
+            return env_type
+
+
+def _cache_environment(env_types, env_type):
+    "Store env_type as the environment detected on this host in the environment cache."
+    now = time.time()
+    cache = {hostname: entry for hostname, entry in _load_environment_cache().items()
+             if isinstance(entry, dict) and now - entry.get('time', 0) < ENVIRONMENT_CACHE_TTL}
+    cache[socket.gethostname()] = {
+        'environment': env_type.__name__,
+        'registry': [env_type_.__name__ for env_type_ in env_types],
+        'time': now,
+    }
+    try:
+        _mkdir_p(os.path.dirname(ENVIRONMENT_CACHE))
+        fn_tmp = '{}._{}'.format(ENVIRONMENT_CACHE, uuid.uuid4())
+        with open(fn_tmp, 'w') as file:
+            json.dump(cache, file)
+        _replace(fn_tmp, ENVIRONMENT_CACHE)
+    except (IOError, OSError) as error:
+        logger.debug("Unable to update the environment cache: '{}'.".format(error))
+
+
 def registered_environments(import_configured=True):
     if import_configured:
         _import_configured_environments()
@@ -378,7 +490,16 @@ def get_environment(test=False, import_configured=True):
     This function iterates through all defined ComputeEnvironment
     classes in reversed order of definition and and returns the
     first EnvironmentClass where the is_present() method returns
-    True.
+    True. Environments that are detected by their hostname pattern
+    take precedence over environments that are detected by probing
+    their scheduler.
+
+    Environments that are detected by their hostname pattern are cached
+    per host within the ENVIRONMENT_CACHE file for ENVIRONMENT_CACHE_TTL
+    seconds and as long as the registered environments remain unchanged.
+    Environments that are detected otherwise, e.g., by probing a scheduler,
+    and the fallback environment are never cached, since their presence
+    may change between invocations.
 
     :param test:
         Return the TestEnvironment
@@ -415,11 +536,15 @@ def get_environment(test=False, import_configured=True):
                 logger.debug("Select environment '{}'; DEBUG=True.".format(env_type.__name__))
                 return env_type
 
-        # Default selection:
-        for env_type in reversed(env_types):
-            if env_type.is_present():
-                logger.debug("Select environment '{}'; is present.".format(env_type.__name__))
+        # Select the environment previously detected on this host:
+        if ENVIRONMENT_CACHE is not None:
+            env_type = _get_cached_environment(env_types)
+            if env_type is not None:
+                logger.debug("Select environment '{}'; cached.".format(env_type.__name__))
                 return env_type
 
-        # Otherwise, just return a standard environment
-        return StandardEnvironment
+        # Default selection, otherwise just return a standard environment:
+        env_type = _detect_environment(env_types)
+        if ENVIRONMENT_CACHE is not None and _is_detected_by_hostname(env_type):
+            _cache_environment(env_types, env_type)
+        return env_type
@@ -17,7 +17,6 @@ from functools import wraps
 from signac import get_project
 from signac.common import six
 
-from .util.tqdm import tqdm
 from .util.execution import fork
 
 
@@ -244,6 +243,9 @@ def run(parser=None):
     else:
         operation = operation_func
 
+    if args.progress:
+        from .util.tqdm import tqdm
+
     # Serial execution
     if args.np == 1 or len(jobs) < 2:
         if args.timeout is not None:
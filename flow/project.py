@@ -18,6 +18,10 @@ option is to use a FlowGraph.
 from __future__ import print_function
 import sys
 import os
+import re
+import time
+import uuid
+import errno
 import logging
 import warnings
 import argparse
@@ -26,8 +30,10 @@ import json
 import inspect
 import functools
 import contextlib
+import threading
 from collections import defaultdict
 from collections import OrderedDict
+from collections import deque
 from itertools import islice
 from itertools import count
 from hashlib import sha1
@@ -42,28 +48,36 @@ from signac.common import six
 from signac.contrib.hashing import calc_id
 from signac.contrib.filterparse import parse_filter_arg
 
-import jinja2
-from jinja2 import TemplateNotFound as Jinja2TemplateNotFound
-
 from .environment import get_environment
 from .scheduling.base import ClusterJob
 from .scheduling.base import JobStatus
 from .scheduling.status import update_status
+from .scheduling.status import ProjectDocumentStatusStore
+from .scheduling.status import ShardedStatusStore
+from .scheduling.status import SchedulerSnapshot
 from .errors import SubmitError
 from .errors import ConfigKeyError
 from .errors import NoSchedulerError
-from .errors import TemplateError
-from .util import tabulate
-from .util.tqdm import tqdm
 from .util.misc import _positive_int
 from .util.misc import _mkdir_p
+from .util.store import _replace
 from .util.misc import draw_progressbar
 from .util import template_filters as tf
 from .util.misc import add_cwd_to_environment_pythonpath
 from .util.misc import switch_to_directory
 from .util.misc import TrackGetItemDict
 from .util.misc import fullmatch
+from .util.misc import _varying_keys
+from .util.misc import _RateLimiter
+from .util.misc import _ThreadLocalStream
+from .util.misc import _physical_memory
+from .util.misc import _lock_file
 from .util.progressbar import with_progressbar
+from .util.status_cache import JobStatusCache
+from .util.status_cache import job_fingerprint
+from .util.stats import record_stats
+from .util.stats import load_stats
+from .util.stats import summarize_stats
 from .util.translate import abbreviate
 from .util.translate import shorten
 from .util.execution import fork
@@ -81,6 +95,10 @@ if six.PY2:
     logger.addHandler(logging.NullHandler())
 
 
+# The names of job array tasks as reported by the scheduler: '<job array id>[<task id>]'.
+_ARRAY_TASK_NAME = re.compile(r'^(.*)\[(\d+)\]$')
+
+
 # The TEMPLATE_HELP can be shown with the --template-help option available to all
 # command line sub commands that use the templating system.
 TEMPLATE_HELP = """Execution and submission scripts are generated with the jinja2 template files.
@@ -129,7 +147,49 @@ class _condition(object):
 
     @classmethod
     def not_(cls, condition):
-        return cls(lambda job: not condition(job))
+        return cls(lambda job: not _evaluate_condition(condition, job))
+
+    @classmethod
+    def batch(cls, func):
+        """Use a function that evaluates the condition for many jobs at once.
+
+        The function is called with a sequence of jobs and must return a sequence
+        of boolean values, one for each job, for example:
+
+        .. code-block:: python
+
+            @FlowProject.operation
+            @FlowProject.pre.batch(lambda jobs: [job.sp.a > 0 for job in jobs])
+            def hello(job):
+                print('Hello', job)
+        """
+        func._flow_batch = True
+        return cls(func)
+
+
+def _is_batch_condition(func):
+    "Return True if func is a condition function that evaluates a sequence of jobs."
+    return getattr(func, '_flow_batch', False)
+
+
+def _evaluate_condition(func, job):
+    "Evaluate the condition function func for a single job."
+    if _is_batch_condition(func):
+        return func([job])[0]
+    return func(job)
+
+
+def _make_metacondition(conditions):
+    """Return a condition that is met if and only if all conditions are met.
+
+    The conditions argument is a callable that returns the list of condition
+    functions at evaluation time, since these may still be extended after the
+    metacondition has been created.
+    """
+    def metacondition(job):
+        return all(_evaluate_condition(c, job) for c in conditions())
+    metacondition._flow_conditions = conditions
+    return metacondition
 
 
 class _pre(_condition):
@@ -143,17 +203,13 @@ class _pre(_condition):
     @classmethod
     def copy_from(cls, other_func):
         "True if and only if all pre conditions of other function are met."
-        def metacondition(job):
-            pre_conditions = getattr(other_func, '_flow_pre', list())
-            return all(c(job) for c in pre_conditions)
-        return cls(metacondition)
+        return cls(_make_metacondition(lambda: getattr(other_func, '_flow_pre', list())))
 
     @classmethod
     def after(cls, other_func):
         "True if and only if all post conditions of other function are met."
-        def metacondition(job):
-            post_conditions = getattr(other_func, '_flow_post', list())
-            return all(c(job) for c in post_conditions)
+        metacondition = _make_metacondition(lambda: getattr(other_func, '_flow_post', list()))
+        metacondition._flow_after = other_func
         return cls(metacondition)
 
 
@@ -171,10 +227,7 @@ class _post(_condition):
     @classmethod
     def copy_from(cls, other_func):
         "True if and only if all post conditions of other function are met."
-        def metacondition(job):
-            post_conditions = getattr(other_func, '_flow_post', list())
-            return all(c(job) for c in post_conditions)
-        return cls(metacondition)
+        return cls(_make_metacondition(lambda: getattr(other_func, '_flow_post', list())))
 
 
 def make_bundles(operations, size=None):
@@ -193,6 +246,97 @@ def make_bundles(operations, size=None):
             break
 
 
+def _walltime_hours(walltime):
+    "Return the walltime provided in hours or as datetime.timedelta in hours."
+    if walltime is None:
+        return 0
+    if isinstance(walltime, datetime.timedelta):
+        return walltime.total_seconds() / 3600
+    return walltime
+
+
+def _num_processors(op):
+    "Return the number of processors requested by op, see the 'np' directive."
+    return op.directives['np'] * op.directives.get('processor_fraction', 1)
+
+
+def _requested_resources(op):
+    """Return the resources requested by op for packed execution.
+
+    The resources are the number of processes, processors, GPUs, and the memory
+    in GB, as requested with the 'np', 'ngpu', and 'memory' directives.
+    """
+    return 1, _num_processors(op), op.directives['ngpu'], op.directives.get('memory') or 0
+
+
+def make_packed_bundles(operations, num_nodes, cores_per_node, gpus_per_node=None):
+    """Pack operations into bundles that fill the given number of nodes.
+
+    All operations of one bundle are assumed to be executed in parallel. The
+    operations are assigned to the first bundle with sufficient free processors
+    and GPUs, as requested with the 'np' and 'ngpu' directives, in order of
+    decreasing estimated walltime, as provided with the 'walltime' directive in
+    hours, and decreasing number of processors (first-fit decreasing). This way
+    operations with similar walltimes are bundled together. Operations that
+    request more resources than available are placed into a bundle of their own.
+
+    :param operations:
+        The operations to bundle.
+    :param num_nodes:
+        The number of nodes per bundle.
+    :param cores_per_node:
+        The number of processors available per node.
+    :param gpus_per_node:
+        The number of GPUs available per node; the number of GPUs is
+        not considered if this argument is None.
+    """
+    def _key(op):
+        return (_walltime_hours(op.directives.get('walltime')), _num_processors(op),
+                op.directives['ngpu'])
+
+    cores = num_nodes * cores_per_node
+    gpus = None if gpus_per_node is None else num_nodes * gpus_per_node
+    bundles = []    # Each bundle is a list of free cores, free gpus, and operations.
+    open_bundles = []
+    for op in sorted(operations, key=_key, reverse=True):
+        np, ngpu = _num_processors(op), op.directives['ngpu']
+        for bundle in open_bundles:
+            if bundle[0] >= np and (gpus is None or bundle[1] >= ngpu):
+                break
+        else:
+            bundle = [cores, gpus, []]
+            bundles.append(bundle)
+            open_bundles.append(bundle)
+        bundle[0] -= np
+        if gpus is not None:
+            bundle[1] -= ngpu
+        bundle[2].append(op)
+        if bundle[0] <= 0:
+            open_bundles.remove(bundle)
+    for bundle in bundles:
+        yield bundle[2]
+
+
+def make_job_arrays(operations, max_size=None):
+    """Group operations into job arrays of operations with equal name and directives.
+
+    The groups are yielded in the order of their first operation and groups
+    with more than max_size operations are split.
+
+    :param operations:
+        The operations to group.
+    :param max_size:
+        The maximum number of operations per job array, unlimited if None.
+    """
+    groups = OrderedDict()
+    for op in operations:
+        key = op.name, json.dumps(op.directives, sort_keys=True, default=str)
+        groups.setdefault(key, []).append(op)
+    for group in groups.values():
+        for array in make_bundles(group, max_size):
+            yield array
+
+
 class JobOperation(object):
     """This class represents the information needed to execute one operation for one job.
 
@@ -227,9 +371,12 @@ class JobOperation(object):
     """
     MAX_LEN_ID = 100
 
+    __slots__ = ('_name', '_job', 'cmd', 'directives', '_ids')
+
     def __init__(self, name, job, cmd, directives=None, np=None):
-        self.name = name
-        self.job = job
+        self._name = name
+        self._job = job
+        self._ids = dict()  # The ids are cached, since they are expensive to compute.
         self.cmd = cmd
         if directives is None:
             directives = dict()  # default argument
@@ -266,6 +413,16 @@ class JobOperation(object):
             {key: evaluate(value) for key, value in directives.items()})
         self.directives._keys_set_by_user = keys_set_by_user
 
+    @property
+    def name(self):
+        "The name of this job-operation."
+        return self._name
+
+    @property
+    def job(self):
+        "The job associated with this job-operation."
+        return self._job
+
     def __str__(self):
         return "{}({})".format(self.name, self.job)
 
@@ -279,6 +436,13 @@ class JobOperation(object):
 
     def get_id(self, index=0):
         "Return a name, which identifies this job-operation."
+        try:
+            return self._ids[index]
+        except KeyError:
+            job_op_id = self._ids[index] = self._compute_id(index)
+            return job_op_id
+
+    def _compute_id(self, index):
         project = self.job._project
 
         # The full name is designed to be truly unique for each job-operation.
@@ -304,22 +468,58 @@ class JobOperation(object):
         return readable_name + job_op_id
 
     def __hash__(self):
-        return int(sha1(self.get_id().encode('utf-8')).hexdigest(), 16)
+        return hash(self.get_id())
 
     def __eq__(self, other):
         return self.get_id() == other.get_id()
 
     def set_status(self, value):
         "Store the operation's status."
-        self.job._project.document.setdefault('_status', dict())
-        self.job._project.document._status[self.get_id()] = int(value)
+        self.job._project._set_operation_status(self.get_id(), value)
 
     def get_status(self):
         "Retrieve the operation's last known status."
-        try:
-            return JobStatus(self.job._project.document['_status'][self.get_id()])
-        except KeyError:
-            return JobStatus.unknown
+        return self.job._project._get_operation_status(self.get_id())
+
+
+class _ConditionCache(object):
+    """Memoize the values of conditions for specific jobs.
+
+    The values are keyed by (callback, job id) tuples. The number of cache
+    hits and misses is recorded for debugging purposes.
+    Access to the cache is thread-safe.
+
+    :param values:
+        A mapping of initial values, e.g., values of batch conditions.
+    """
+
+    def __init__(self, values=None):
+        self._values = dict() if values is None else dict(values)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __getitem__(self, key):
+        with self._lock:
+            try:
+                value = self._values[key]
+            except KeyError:
+                self.misses += 1
+                raise
+            else:
+                self.hits += 1
+                return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._values[key] = value
+
+    def __len__(self):
+        return len(self._values)
+
+    def info(self):
+        "Return a dict with the number of cache hits, misses, and the cache size."
+        return dict(hits=self.hits, misses=self.misses, size=len(self))
 
 
 class FlowCondition(object):
@@ -329,6 +529,11 @@ class FlowCondition(object):
     or False, representing whether the condition is met or not.
     This can be used to build a graph of conditions and operations.
 
+    A condition may also be evaluated for a sequence of jobs at once with the
+    :meth:`~.evaluate` method. This is particularly efficient for batch conditions,
+    that means callbacks which expect a sequence of jobs and return a sequence
+    of boolean values, see :meth:`FlowProject.pre.batch`.
+
     :param callback:
         A function with one positional argument (the job)
     :type callback:
@@ -338,10 +543,57 @@ class FlowCondition(object):
     def __init__(self, callback):
         self._callback = callback
 
-    def __call__(self, job):
+    def __call__(self, job, cache=None):
+        """Evaluate the condition for job.
+
+        :param cache:
+            An optional mapping of (callback, job id) to previously determined
+            condition values, e.g., as returned by :meth:`~.evaluate_batch`.
+            The value is stored in the cache if it had to be evaluated.
+        """
         if self._callback is None:
             return True
-        return self._callback(job)
+        if cache is None:
+            return self._evaluate(job, cache)
+        key = (self._callback, job.get_id())
+        try:
+            return cache[key]
+        except KeyError:
+            value = cache[key] = self._evaluate(job, cache)
+            return value
+
+    def _evaluate(self, job, cache):
+        conditions = getattr(self._callback, '_flow_conditions', None)
+        if conditions is not None:  # Evaluate the parts of a metacondition individually.
+            return all(FlowCondition(c)(job, cache) for c in conditions())
+        return _evaluate_condition(self._callback, job)
+
+    def batch_callbacks(self):
+        "Return the set of all batch condition callbacks this condition is composed of."
+        if _is_batch_condition(self._callback):
+            return {self._callback}
+        callbacks = set()
+        for c in getattr(self._callback, '_flow_conditions', list)():
+            callbacks.update(FlowCondition(c).batch_callbacks())
+        return callbacks
+
+    @staticmethod
+    def evaluate_batch(callbacks, jobs):
+        """Evaluate all batch condition callbacks for jobs at once.
+
+        :return:
+            A dict, which maps (callback, job id) to the value of the condition.
+        """
+        ids = [job.get_id() for job in jobs]
+        result = dict()
+        for callback in callbacks:
+            values = list(callback(jobs))
+            if len(values) != len(ids):
+                raise ValueError(
+                    "The batch condition '{}' returned {} values for {} jobs.".format(
+                        getattr(callback, '__name__', callback), len(values), len(ids)))
+            result.update(((callback, _id), value) for _id, value in zip(ids, values))
+        return result
 
     def __hash__(self):
         return hash(self._callback)
@@ -418,22 +670,46 @@ class FlowOperation(object):
     def __str__(self):
         return "{type}(cmd='{cmd}')".format(type=type(self).__name__, cmd=self._cmd)
 
-    def eligible(self, job):
-        "Eligible, when all pre-conditions are true and at least one post-condition is false."
-        pre = all(cond(job) for cond in self._prereqs)
+    def eligible(self, job, cache=None):
+        """Eligible, when all pre-conditions are true and at least one post-condition is false.
+
+        The pre-conditions declared with pre.after() are evaluated first, such that
+        the other conditions are not evaluated as long as an upstream operation is
+        incomplete.
+        """
+        pre = self.upstream_met(job, cache) and \
+            all(cond(job, cache) for cond in self._prereqs
+                if not hasattr(cond._callback, '_flow_after'))
         if pre and len(self._postconds):
-            post = any(not cond(job) for cond in self._postconds)
+            post = any(not cond(job, cache) for cond in self._postconds)
         else:
             post = True
         return pre and post
 
-    def complete(self, job):
+    def complete(self, job, cache=None):
         "True when all post-conditions are met."
         if len(self._postconds):
-            return all(cond(job) for cond in self._postconds)
+            return all(cond(job, cache) for cond in self._postconds)
         else:
             return False
 
+    def upstream(self):
+        "Return the list of functions that must be complete for this operation to be eligible."
+        return [cond._callback._flow_after for cond in self._prereqs
+                if hasattr(cond._callback, '_flow_after')]
+
+    def upstream_met(self, job, cache=None):
+        "True when the pre-conditions declared with pre.after() are met."
+        return all(cond(job, cache) for cond in self._prereqs
+                   if hasattr(cond._callback, '_flow_after'))
+
+    def batch_callbacks(self):
+        "Return the set of all batch condition callbacks of this operation."
+        callbacks = set()
+        for cond in self._prereqs + self._postconds:
+            callbacks.update(cond.batch_callbacks())
+        return callbacks
+
     def __call__(self, job=None):
         if callable(self._cmd):
             return self._cmd(job).format(job=job)
@@ -487,8 +763,9 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
     def __init__(self, config=None, environment=None):
         super(FlowProject, self).__init__(config=config)
 
-        # Associate this class with a compute environment.
-        self._environment = environment or get_environment()
+        # Associate this class with a compute environment; the environment is
+        # only detected once it is needed, see _environment.
+        self._environment_ = environment
 
         # The standard local template directory is a directory called 'templates' within
         # the project root directory. This directory may be specified with the 'template_dir'
@@ -503,15 +780,71 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
 
         # Register all operation functions with this project instance.
         self._operation_functions = dict()
+        self._operation_exec_cmds = dict()  # The 'exec' commands of shell command operations.
         self._operations = OrderedDict()
+        self._operation_graph = dict()
         self._register_operations()
 
+        # Memoized condition values, only used within the scope of _conditions_cached().
+        self._condition_cache = None
+        self._condition_cache_info = None
+
         # Enable the use of buffered mode for certain functions
         try:
             self._use_buffered_mode = self.config['flow'].as_bool('use_buffered_mode')
         except KeyError:
             self._use_buffered_mode = False
 
+        # The scheduler status of job-operations is stored in the status store.
+        try:
+            self._status_store_type = self.config['flow']['status_store']
+        except KeyError:
+            self._status_store_type = 'sharded'
+        if self._status_store_type not in ('sharded', 'document'):
+            raise ValueError(
+                "Invalid value for configuration key 'flow.status_store': '{}', expected "
+                "either 'sharded' or 'document'.".format(self._status_store_type))
+        self._status_store_ = None
+
+        # Operation status updates that have not been written yet, see _buffered_status_updates().
+        self._status_buffer = None
+
+        # Enable the use of the persistent status cache
+        try:
+            self._use_status_cache = self.config['flow'].as_bool('use_status_cache')
+        except KeyError:
+            self._use_status_cache = False
+
+        # Share the result of scheduler queries within a time window of the configured length.
+        try:
+            scheduler_snapshot_ttl = self.config['flow'].as_float('scheduler_snapshot_ttl')
+        except KeyError:
+            scheduler_snapshot_ttl = 0
+        try:
+            persistent = self.config['flow'].as_bool('scheduler_snapshot_persistent')
+        except KeyError:
+            persistent = False
+        self._scheduler_snapshot = SchedulerSnapshot(
+            ttl=scheduler_snapshot_ttl,
+            fn=self._fn_scheduler_snapshot() if persistent else None)
+
+        # Record the resource usage of executed operations if enabled, see print_stats().
+        try:
+            self._record_stats = self.config['flow'].as_bool('record_stats')
+        except KeyError:
+            self._record_stats = False
+
+    @property
+    def _environment(self):
+        "The compute environment associated with this project."
+        if self._environment_ is None:
+            self._environment_ = get_environment()
+        return self._environment_
+
+    @_environment.setter
+    def _environment(self, environment):
+        self._environment_ = environment
+
     def _setup_template_environment(self):
         """Setup the jinja2 template environemnt.
 
@@ -519,6 +852,9 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         and submit_operations() / submit() function and the corresponding command line
         sub commands.
         """
+        import jinja2
+        from .util.template_extensions import TemplateError
+
         if self._config.get('flow') and self._config['flow'].get('environment_modules'):
             envs = self._config['flow'].as_list('environment_modules')
         else:
@@ -538,10 +874,14 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                      extra_packages +
                      [jinja2.PackageLoader('flow', 'templates')])
 
+        # Templates are loaded at most once per template environment and their
+        # compiled code is reused across processes via the bytecode cache.
         template_environment = jinja2.Environment(
             loader=jinja2.ChoiceLoader(load_envs),
             trim_blocks=True,
-            extensions=[TemplateError])
+            extensions=[TemplateError],
+            auto_reload=False,
+            bytecode_cache=self._template_bytecode_cache())
 
         # Setup standard filters that can be used to format context variables.
         template_environment.filters['format_timedelta'] = tf.format_timedelta
@@ -563,6 +903,62 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             template_environment.filters['min'] = min
         return template_environment
 
+    def _fn_template_cache(self):
+        "Return the canonical name of the directory used to cache compiled templates."
+        return os.path.join(self.root_directory(), '.template_cache')
+
+    def _fn_stats(self):
+        "Return the canonical name of the file used to log the resource usage of operations."
+        return os.path.join(self.root_directory(), '.stats', 'operations.jsonl')
+
+    @contextlib.contextmanager
+    def _recorded(self, name, job, own_process=False):
+        """Record the resource usage of the named operation executed for job, if enabled.
+
+        See :func:`~.util.stats.record_stats` for the function yielded by this context.
+        """
+        if self._record_stats:
+            with record_stats(self._fn_stats(), name, job, own_process) as record_usage:
+                yield record_usage
+        else:
+            yield lambda usage: None
+
+    def _recorded_cmd(self, operation):
+        """Return the command of operation, such that its resource usage is recorded.
+
+        If the recording is enabled, operations defined as shell commands are executed
+        with the 'exec' command, which records their usage, unless the command is
+        executed by multiple MPI ranks. The commands of operation functions are
+        always executed with the 'exec' command.
+        """
+        try:
+            cmd = self._operation_exec_cmds[operation.name]
+        except KeyError:
+            return operation.cmd
+        if self._record_stats and not operation.directives.get('nranks'):
+            return cmd.format(job=operation.job)
+        return operation.cmd
+
+    def _template_bytecode_cache(self):
+        """Return the bytecode cache for compiled templates or None if it is disabled.
+
+        The cache is enabled unless the configuration value `flow.template_cache`
+        is false. Cached templates are invalidated when their source changes.
+        """
+        try:
+            if not self.config['flow'].as_bool('template_cache'):
+                return None
+        except KeyError:
+            pass
+        directory = self._fn_template_cache()
+        try:
+            _mkdir_p(directory)
+        except (IOError, OSError) as error:
+            logger.debug("Unable to create the template cache: '{}'.".format(error))
+            return None
+        import jinja2
+        return jinja2.FileSystemBytecodeCache(directory)
+
     def _template_environment(self, environment=None):
         if environment is None:
             environment = self._environment
@@ -755,17 +1151,31 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         cls.ALIASES.update(aliases)
 
     def _fn_bundle(self, bundle_id):
-        "Return the canonical name to store bundle information."
+        "Return the canonical name to store bundle information (only used by previous versions)."
         return os.path.join(self.root_directory(), '.bundles', bundle_id)
 
+    def _fn_bundle_index(self):
+        "Return the canonical name of the file used to index all bundles."
+        return os.path.join(self.root_directory(), '.bundles', 'index.jsonl')
+
+    @contextlib.contextmanager
+    def _bundle_index_locked(self):
+        "Hold the lock of the bundle index, shared by all threads and processes, in this context."
+        with self._bundle_index_lock:
+            with _lock_file(os.path.join(self.root_directory(), '.bundles', 'index.lock')):
+                yield
+
+    BUNDLE_GC_MIN_AGE = 3600
+    "Bundles are kept for at least this many seconds, even if their cluster job is unknown."
+
     def _store_bundled(self, operations):
         """Store operation-ids as part of a bundle and return bundle id.
 
-        The operation identifiers are stored in a  text within a file
-        determined by the _fn_bundle() method.
+        The operation identifiers are appended to the bundle index, which is
+        stored within the file determined by the _fn_bundle_index() method.
 
-        This may be used to idenfity the status of individual operations
-        root directory. This is necessary to be able to identify each
+        This is necessary to be able to identify the status of individual
+        operations which were submitted as part of a bundle.
 
         A single operation will not be stored, but instead the operation's
         id is directly returned.
@@ -784,20 +1194,143 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         else:
             h = '.'.join(op.get_id() for op in operations)
             bid = '{}/bundle/{}'.format(self, sha1(h.encode('utf-8')).hexdigest())
-            fn_bundle = self._fn_bundle(bid)
-            _mkdir_p(os.path.dirname(fn_bundle))
-            with open(fn_bundle, 'w') as file:
-                for operation in operations:
-                    file.write(operation.get_id() + '\n')
+            self._add_bundle_to_index(bid, operations)
             return bid
 
+    # Serializes the modification of the bundle index by concurrent threads, see _submit_bundles().
+    _bundle_index_lock = threading.Lock()
+
+    def _store_job_array(self, operations, task_id_offset=0):
+        """Store operation-ids as part of a job array and return the job array id.
+
+        The operation with index i is executed by the job array task with the
+        id task_id_offset + i.
+        """
+        h = '.'.join(op.get_id() for op in operations)
+        aid = '{}/array/{}'.format(self, sha1(h.encode('utf-8')).hexdigest())
+        self._add_bundle_to_index(aid, operations, task_id_offset)
+        return aid
+
+    def _add_bundle_to_index(self, bundle_id, operations, task_id_offset=None):
+        """Append the bundle with the given id and operations to the bundle index.
+
+        The task id offset is only stored for job arrays.
+        """
+        fn_index = self._fn_bundle_index()
+        _mkdir_p(os.path.dirname(fn_index))
+        entry = [bundle_id, time.time(), [op.get_id() for op in operations]]
+        if task_id_offset is not None:
+            entry.append(task_id_offset)
+        with self._bundle_index_locked():
+            with open(fn_index, 'a') as file:
+                file.write(json.dumps(entry) + '\n')
+
+    def _load_bundle_index(self):
+        """Return a mapping of bundle ids to the time of creation and the ids of all operations.
+
+        The entries of job arrays additionally contain the task id offset.
+        """
+        index = dict()
+        try:
+            with open(self._fn_bundle_index()) as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:  # incomplete entry, e.g., due to an interrupted write
+                        continue
+                    index[entry[0]] = tuple(entry[1:])
+        except (IOError, OSError) as error:
+            if error.errno != errno.ENOENT:
+                raise
+        return index
+
+    def _gc_bundles(self, active):
+        """Remove all bundles whose cluster jobs are no longer known to the scheduler.
+
+        Bundles that were stored less than BUNDLE_GC_MIN_AGE seconds ago are never
+        removed, because their cluster jobs might not be known to the scheduler yet.
+
+        :param active:
+            The names of all cluster jobs that are known to the scheduler.
+        """
+        now = time.time()
+
+        def _keep(index):
+            return [(bundle_id, entry) for bundle_id, entry in index.items()
+                    if bundle_id in active or now - entry[0] < self.BUNDLE_GC_MIN_AGE]
+
+        index = self._load_bundle_index()
+        if len(_keep(index)) < len(index):
+            # The index is re-read under the lock, such that bundles that are
+            # concurrently added to the index are not lost.
+            with self._bundle_index_locked():
+                index = self._load_bundle_index()
+                keep = _keep(index)
+                logger.debug("Removing {} bundles from the index.".format(len(index) - len(keep)))
+                fn_index = self._fn_bundle_index()
+                fn_tmp = os.path.join(os.path.dirname(fn_index), '._{}'.format(uuid.uuid4()))
+                with open(fn_tmp, 'w') as file:
+                    for bundle_id, entry in sorted(keep, key=lambda x: x[1][0]):
+                        file.write(json.dumps([bundle_id] + list(entry)) + '\n')
+                _replace(fn_tmp, fn_index)
+
+        # Bundles stored by previous versions, one file per bundle:
+        prefix = '{}/bundle/'.format(self)
+        root = os.path.dirname(self._fn_bundle(prefix + '_'))
+        try:
+            fns = os.listdir(root)
+        except (IOError, OSError) as error:
+            if error.errno != errno.ENOENT:
+                raise
+            fns = []
+        for fn in fns:
+            fn_bundle = os.path.join(root, fn)
+            if prefix + fn not in active and now - os.path.getmtime(fn_bundle) >= \
+                    self.BUNDLE_GC_MIN_AGE:
+                os.remove(fn_bundle)
+
     def _expand_bundled_jobs(self, scheduler_jobs):
-        "Expand jobs which were submitted as part of a bundle."
+        """Expand jobs which were submitted as part of a bundle or job array.
+
+        Job array tasks are expected to be named '<job array id>[<task id>]',
+        cluster jobs named after the job array itself apply to all of its tasks.
+        """
+        prefix = '{}/bundle/'.format(self)
+        prefix_array = '{}/array/'.format(self)
+        index = None
         for job in scheduler_jobs:
-            if job.name().startswith('{}/bundle/'.format(self)):
-                with open(self._fn_bundle(job.name())) as file:
-                    for line in file:
-                        yield ClusterJob(line.strip(), job.status())
+            if job.name().startswith(prefix_array):
+                if index is None:
+                    index = self._load_bundle_index()
+                m = _ARRAY_TASK_NAME.match(job.name())
+                try:
+                    if m is None:
+                        op_ids = index[job.name()][1]
+                    else:
+                        _, op_ids, offset = index[m.group(1)]
+                        i = int(m.group(2)) - offset
+                        op_ids = op_ids[i:i + 1] if i >= 0 else []
+                except KeyError:
+                    logger.warning("Unknown job array '{}'.".format(job.name()))
+                    continue
+                for op_id in op_ids:
+                    yield ClusterJob(op_id, job.status())
+            elif job.name().startswith(prefix):
+                if index is None:
+                    index = self._load_bundle_index()
+                try:
+                    op_ids = index[job.name()][1]
+                except KeyError:    # bundle stored by a previous version
+                    try:
+                        with open(self._fn_bundle(job.name())) as file:
+                            op_ids = [line.strip() for line in file]
+                    except (IOError, OSError) as error:
+                        if error.errno != errno.ENOENT:
+                            raise
+                        logger.warning("Unknown bundle '{}'.".format(job.name()))
+                        continue
+                for op_id in op_ids:
+                    yield ClusterJob(op_id, job.status())
             else:
                 yield job
 
@@ -805,7 +1338,9 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         """Fetch jobs from the scheduler.
 
         This function will fetch all scheduler jobs from the scheduler
-        and also expand bundled jobs automatically.
+        and also expand bundled jobs automatically. The result of the
+        scheduler query is reused within the time window defined by the
+        `flow.scheduler_snapshot_ttl` configuration value (in seconds).
 
         However, this function will not automatically filter scheduler
         jobs which are not associated with this project.
@@ -817,9 +1352,24 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         :yields:
             All scheduler jobs fetched from the scheduler instance.
         """
-        for sjob in self._expand_bundled_jobs(scheduler.jobs()):
+        for sjob in self._expand_bundled_jobs(self._scheduler_snapshot.jobs(scheduler)):
             yield sjob
 
+    def _scheduler_job_name_prefix(self):
+        "Return the prefix of the names of all cluster jobs submitted for this project."
+        # Both the job-operation ids and the bundle ids start with the project id, however
+        # the project id is truncated in the job-operation ids, see JobOperation.get_id().
+        return str(self)[:12]
+
+    def _project_scheduler_jobs(self, scheduler):
+        """Fetch the jobs associated with this project from the scheduler.
+
+        In contrast to :meth:`~.scheduler_jobs`, only the scheduler jobs whose name
+        starts with the name prefix of this project are queried, which allows the
+        scheduler to filter the jobs by name. Bundled jobs are not expanded.
+        """
+        return self._scheduler_snapshot.jobs(scheduler, self._scheduler_job_name_prefix())
+
     @staticmethod
     def _map_scheduler_jobs(scheduler_jobs):
         "Map all scheduler jobs by job id and operation name."
@@ -833,8 +1383,8 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         "Return a dict with information about job-operations for this job."
         for job_op in self._job_operations([job], False):
             flow_op = self.operations[job_op.name]
-            completed = flow_op.complete(job)
-            eligible = False if completed else flow_op.eligible(job)
+            completed = flow_op.complete(job, self._condition_cache)
+            eligible = not completed and flow_op.eligible(job, self._condition_cache)
             scheduler_status = cached_status.get(job_op.get_id(), JobStatus.unknown)
             yield job_op.name, {
                 'scheduler_status': scheduler_status,
@@ -848,11 +1398,10 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         result['job_id'] = str(job)
         try:
             if cached_status is None:
-                try:
-                    cached_status = self.document['_status']._as_dict()
-                except KeyError:
-                    cached_status = dict()
-            result['operations'] = OrderedDict(self._get_operations_status(job, cached_status))
+                cached_status = self._status_store.snapshot()
+            with self._conditions_cached([job]):
+                result['operations'] = OrderedDict(
+                    self._get_operations_status(job, cached_status))
             result['_operations_error'] = None
         except Exception as error:
             msg = "Error while getting operations status for job '{}': '{}'.".format(job, error)
@@ -874,6 +1423,77 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                 raise
         return result
 
+    def _fn_scheduler_snapshot(self):
+        "Return the canonical name of the file used to share the scheduler snapshot."
+        return os.path.join(self.root_directory(), '.scheduler_snapshot.json')
+
+    def _fn_status_cache(self):
+        "Return the canonical name of the directory used to store the status cache."
+        return os.path.join(self.root_directory(), '.status_cache')
+
+    def _status_cache_definition(self):
+        """Return a key that identifies the current definition of labels and operations.
+
+        The key changes whenever labels or operations are added, removed, or renamed,
+        or when any of the source files that define them are modified.
+        """
+        functions = [type(self)]
+        functions.extend(self._label_functions)
+        functions.extend(self._operation_functions.values())
+        functions.extend(op._cmd for op in self._operations.values() if callable(op._cmd))
+        sources = set()
+        for func in functions:
+            try:
+                fn = inspect.getsourcefile(func)
+            except TypeError:   # built-in or otherwise inaccessible source
+                continue
+            if fn and os.path.isfile(fn):
+                sources.add(fn)
+        return calc_id({
+            'labels': [getattr(func, '__name__', str(func)) for func in self._label_functions],
+            'operations': list(self._operations),
+            'sources': sorted([fn, os.path.getmtime(fn)] for fn in sources),
+        })
+
+    def _open_status_cache(self):
+        "Return a handle to the persistent status cache of this project."
+        return JobStatusCache(self._fn_status_cache(), self._status_cache_definition())
+
+    def _get_job_status_cached(self, job, status_cache, ignore_errors=False, cached_status=None,
+                               fingerprint=None):
+        """Return a dict with detailed information about the status of a job.
+
+        Labels and operation conditions are only evaluated if the status cache
+        does not contain a valid entry for the job, the scheduler status is always
+        determined from the cached_status argument.
+        """
+        if fingerprint is None:
+            fingerprint = job_fingerprint(job)
+        entry = status_cache.get(job, fingerprint)
+        if entry is None:
+            status = self.get_job_status(
+                job, ignore_errors=ignore_errors, cached_status=cached_status)
+            if status['_operations_error'] is None and status['_labels_error'] is None:
+                status_cache.set(job, fingerprint, status)
+            return status
+
+        if cached_status is None:
+            cached_status = self._status_store.snapshot()
+        result = dict()
+        result['job_id'] = str(job)
+        result['operations'] = OrderedDict()
+        for name, eligible, completed in entry['operations']:
+            job_op_id = JobOperation(name=name, job=job, cmd=None).get_id()
+            result['operations'][name] = {
+                'scheduler_status': cached_status.get(job_op_id, JobStatus.unknown),
+                'eligible': eligible,
+                'completed': completed,
+            }
+        result['_operations_error'] = None
+        result['labels'] = entry['labels']
+        result['_labels_error'] = None
+        return result
+
     def _format_row(self, status, statepoint=None, max_width=None):
         "Format each row in the detailed status output."
         row = [
@@ -901,8 +1521,74 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             row[2] += ' ' + self._alias('requires_attention')
         return row
 
+    def _fn_status_store(self):
+        "Return the canonical name of the directory used to store the operation status."
+        return os.path.join(self.root_directory(), '.status')
+
+    @property
+    def _status_store(self):
+        """The store for the scheduler status of job-operations.
+
+        The status is stored in a sharded store within the project root directory
+        by default. Set the configuration value `flow.status_store` to 'document'
+        to store the status within the project document instead.
+        Status information stored in the project document is migrated to the
+        sharded store upon first access.
+        """
+        if self._status_store_ is None:
+            if self._status_store_type == 'document':
+                self._status_store_ = ProjectDocumentStatusStore(self)
+            else:
+                store = ShardedStatusStore(self._fn_status_store())
+                if '_status' in self.document:
+                    store.migrate(ProjectDocumentStatusStore(self))
+                self._status_store_ = store
+        return self._status_store_
+
+    def _get_operation_status(self, job_op_id):
+        "Return the last known scheduler status of the job-operation with the given id."
+        if self._status_buffer is not None and job_op_id in self._status_buffer:
+            return JobStatus(self._status_buffer[job_op_id])
+        return JobStatus(self._status_store.get(job_op_id, JobStatus.unknown))
+
+    def _set_operation_status(self, job_op_id, value):
+        "Store the scheduler status of the job-operation with the given id."
+        self._set_operation_status_many({job_op_id: value})
+
+    def _set_operation_status_many(self, statuses):
+        """Store the scheduler status of many job-operations at once.
+
+        :param statuses:
+            A mapping of job-operation ids to their scheduler status.
+        """
+        statuses = {job_op_id: int(value) for job_op_id, value in statuses.items()}
+        if self._status_buffer is not None:
+            self._status_buffer.update(statuses)
+        else:
+            self._status_store.update(statuses)
+
+    @contextlib.contextmanager
+    def _buffered_status_updates(self):
+        """Collect all operation status updates within this context.
+
+        The collected updates are written at once when the context is exited,
+        instead of rewriting the project document for each individual update.
+        The updates are written even if an error occurs within the context,
+        since they typically record the submission of operations.
+        """
+        if self._status_buffer is not None:     # already buffered
+            yield
+            return
+        self._status_buffer = dict()
+        try:
+            yield
+        finally:
+            statuses, self._status_buffer = self._status_buffer, None
+            self._set_operation_status_many(statuses)
+
     def _fetch_scheduler_status(self, jobs=None, file=None, ignore_errors=False):
         "Update the status docs."
+        from .util.tqdm import tqdm
         if file is None:
             file = sys.stderr
         if jobs is None:
@@ -910,15 +1596,17 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         try:
             scheduler = self._environment.get_scheduler()
 
-            self.document.setdefault('_status', dict())
-            scheduler_info = {sjob.name(): sjob.status() for sjob in self.scheduler_jobs(scheduler)}
+            cluster_jobs = self._project_scheduler_jobs(scheduler)
+            scheduler_info = {sjob.name(): sjob.status()
+                              for sjob in self._expand_bundled_jobs(cluster_jobs)}
             status = dict()
             print(self._tr("Query scheduler..."), file=file)
             for op in tqdm(self._job_operations(jobs=jobs, only_eligible=False),
                            desc="Fetching operation status",
                            total=len(jobs), file=file):
                 status[op.get_id()] = int(scheduler_info.get(op.get_id(), JobStatus.unknown))
-            self.document._status.update(status)
+            self._set_operation_status_many(status)
+            self._gc_bundles({_ARRAY_TASK_NAME.sub(r'\1', cjob.name()) for cjob in cluster_jobs})
         except NoSchedulerError:
             logger.debug("No scheduler available.")
         except RuntimeError as error:
@@ -928,38 +1616,138 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         else:
             logger.info("Updated job status cache.")
 
-    def _fetch_status(self, jobs, err, ignore_errors, no_parallelize):
+    def _get_job_status_chunk(self, job_ids, ignore_errors=False, cached_status=None):
+        """Yield the status and the fingerprint for each job in job_ids.
+
+        The fingerprint is None unless the status cache is enabled.
+        """
+        status_cache = self._open_status_cache() if self._use_status_cache else None
+        jobs = [self.open_job(id=job_id) for job_id in job_ids]
+        with self._conditions_cached(jobs):
+            for job in jobs:
+                if status_cache is None:
+                    yield self.get_job_status(
+                        job, ignore_errors=ignore_errors, cached_status=cached_status), None
+                else:
+                    fingerprint = job_fingerprint(job)
+                    yield self._get_job_status_cached(
+                        job, status_cache, ignore_errors=ignore_errors,
+                        cached_status=cached_status, fingerprint=fingerprint), fingerprint
+
+    def _fetch_status_in_parallel(self, pickle, jobs, ignore_errors, cached_status, err,
+                                  progress=True):
+        """Determine the status of jobs with a process pool.
+
+        The jobs are split into chunks, which are evaluated by the worker processes.
+        Similar to :meth:`~._run_operations_in_parallel`, the project instance is
+        pickled manually to enable us to try different pickle modules.
+
+        :return:
+            A list of (status, fingerprint) tuples in the order of jobs.
+        """
+        from .util.tqdm import tqdm
+        chunksize = max(1, int(len(jobs) / (4 * cpu_count())))
+        chunks = list(make_bundles((job.get_id() for job in jobs), chunksize))
+        try:
+            s_project = pickle.dumps(self)
+            s_cached_status = pickle.dumps(cached_status)
+        except Exception as error:  # Masking all errors since they must be pickling related.
+            raise self._PickleError(error)
+
+        results = []
+        with contextlib.closing(Pool()) as pool:
+            s_tasks = [(pickle.loads, s_project, chunk, ignore_errors, s_cached_status)
+                       for chunk in chunks]
+            async_results = [pool.apply_async(_get_job_status_with_serialization, task)
+                             for task in s_tasks]
+            with tqdm(desc="Collect job status info", total=len(jobs), file=err,
+                      disable=not progress) as progressbar:
+                for chunk, async_result in zip(chunks, async_results):
+                    results.extend(async_result.get())
+                    progressbar.update(len(chunk))
+        return results
+
+    @staticmethod
+    def _get_parallel_backend(no_parallelize, parallel_backend):
+        if parallel_backend is None:
+            parallel_backend = 'serial' if no_parallelize else 'thread'
+        if parallel_backend not in ('process', 'thread', 'serial'):
+            raise ValueError("Invalid parallel backend '{}', expected one of "
+                             "'process', 'thread', or 'serial'.".format(parallel_backend))
+        return parallel_backend
+
+    def _fetch_status(self, jobs, err, ignore_errors, no_parallelize, parallel_backend=None):
+        parallel_backend = self._get_parallel_backend(no_parallelize, parallel_backend)
+
         # Update the project's status cache
         self._fetch_scheduler_status(jobs, err, ignore_errors)
 
         # Get status dict for all selected jobs
-        def _print_progress(x):
-            print("Updating status: ", end='', file=err)
-            err.flush()
-            n = max(1, int(len(jobs) / 10))
-            for i, _ in enumerate(x):
-                if (i % n) == 0:
-                    print('.', end='', file=err)
-                    err.flush()
-                yield _
+        return self._get_status_many(jobs, err, ignore_errors, parallel_backend)
 
-        try:
-            cached_status = self.document['_status']._as_dict()
-        except KeyError:
-            cached_status = dict()
-        _get_job_status = functools.partial(self.get_job_status,
-                                            ignore_errors=ignore_errors,
-                                            cached_status=cached_status)
+    STATUS_STREAM_CHUNKSIZE = 100
+    "The number of jobs for which the status is determined at once in streaming mode."
 
-        with self._potentially_buffered():
+    def _iter_status(self, jobs, err, ignore_errors, no_parallelize, parallel_backend=None):
+        """Yield the status of jobs in the order of jobs.
+
+        In contrast to :meth:`~._fetch_status`, the status is determined in chunks,
+        such that the status of the first jobs is available immediately and the
+        memory usage does not depend on the number of jobs.
+        """
+        parallel_backend = self._get_parallel_backend(no_parallelize, parallel_backend)
+        self._fetch_scheduler_status(jobs, err, ignore_errors)
+        chunksize = self.STATUS_STREAM_CHUNKSIZE
+        if parallel_backend == 'process':
+            chunksize *= cpu_count()
+        for chunk in make_bundles((job for job in jobs), chunksize):
+            for status in self._get_status_many(
+                    chunk, err, ignore_errors, parallel_backend, progress=False):
+                yield status
+
+    def _get_status_many(self, jobs, err, ignore_errors, parallel_backend, progress=True):
+        "Return the status of jobs with the given parallel backend."
+        from .util.tqdm import tqdm
+        cached_status = self._status_store.snapshot()
+        if self._use_status_cache:
+            # Labels and operation conditions are only evaluated for jobs that were
+            # modified since the last status update.
+            status_cache = self._open_status_cache()
+            _get_job_status = functools.partial(self._get_job_status_cached,
+                                                status_cache=status_cache,
+                                                ignore_errors=ignore_errors,
+                                                cached_status=cached_status)
+        else:
+            status_cache = None
+            _get_job_status = functools.partial(self.get_job_status,
+                                                ignore_errors=ignore_errors,
+                                                cached_status=cached_status)
+
+        if parallel_backend == 'process':
+            jobs = list(jobs)
+            results = self._call_with_serialization(
+                lambda pickle: self._fetch_status_in_parallel(
+                    pickle, jobs, ignore_errors, cached_status, err, progress))
+            statuses = []
+            for job, (status, fingerprint) in zip(jobs, results):
+                if status_cache is not None and \
+                        status['_operations_error'] is None and status['_labels_error'] is None:
+                    status_cache.set(job, fingerprint, status)
+                statuses.append(status)
+            if status_cache is not None:
+                status_cache.flush()
+            return statuses
+
+        with self._potentially_buffered(), self._conditions_cached(jobs):
             try:
                 with contextlib.closing(ThreadPool()) as pool:
-                    _map = map if no_parallelize else pool.imap
+                    _map = map if parallel_backend == 'serial' else pool.imap
                     # First attempt at parallelized status determination.
                     # This may fail on systems that don't allow threads.
-                    return list(tqdm(
+                    statuses = list(tqdm(
                         iterable=_map(_get_job_status, jobs),
-                        desc="Collect job status info", total=len(jobs), file=err))
+                        desc="Collect job status info", total=len(jobs), file=err,
+                        disable=not progress))
             except RuntimeError as error:
                 if "can't start new thread" not in error.args:
                     raise   # unrelated error
@@ -969,9 +1757,16 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                     "A parallelized status update failed due to error ('{}'). "
                     "Entering serial mode with fallback progress indicator. The "
                     "status update may take longer than ususal.".format(error))
-                return list(with_progressbar(
-                    iterable=map(_get_job_status, jobs),
-                    total=len(jobs), desc='Collect job status info:', file=err))
+                statuses = map(_get_job_status, jobs)
+                if progress:
+                    statuses = with_progressbar(
+                        iterable=statuses, total=len(jobs),
+                        desc='Collect job status info:', file=err)
+                statuses = list(statuses)
+
+        if status_cache is not None:
+            status_cache.flush()
+        return statuses
 
     OPERATION_STATUS_SYMBOLS = OrderedDict([
         ('ineligible', u'-'),
@@ -991,6 +1786,9 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
     ])
     "Pretty (unicode) symbols denoting the execution status of operations."
 
+    STATUS_STREAM_PARAM_MAX_WIDTH = 12
+    "The default width of parameter columns in the streamed detailed status view."
+
     PRINT_STATUS_ALL_VARYING_PARAMETERS = True
     """This constant can be used to signal that the print_status() method is supposed
     to automatically show all varying parameters."""
@@ -1001,7 +1799,7 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                      expand=False, all_ops=False, only_incomplete=False, dump_json=False,
                      unroll=True, compact=False, pretty=False,
                      file=None, err=None, ignore_errors=False,
-                     no_parallelize=False):
+                     no_parallelize=False, parallel_backend=None, stream=False):
         """Print the status of the project.
 
         .. versionchanged:: 0.6
@@ -1079,7 +1877,21 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             Do not parallelize the status update.
         :type no_parallelize:
             bool
+        :param parallel_backend:
+            Determine the status of jobs with a process pool ('process'), a thread
+            pool ('thread'), or in serial ('serial'). Defaults to 'serial' if
+            no_parallelize is True, otherwise to 'thread'.
+        :type parallel_backend:
+            str
+        :param stream:
+            Print the rows of the detailed view with a fixed column width as soon as
+            the status of the corresponding jobs has been determined. The overview is
+            printed after the detailed view in this mode. Streaming is not supported
+            in combination with the expand and dump_json options and the stacked view.
+        :type stream:
+            bool
         """
+        from .util import tabulate
         if file is None:
             file = sys.stdout
         if err is None:
@@ -1087,53 +1899,43 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         if jobs is None:
             jobs = self     # all jobs
 
-        tmp = self._fetch_status(jobs, err, ignore_errors, no_parallelize)
-
-        operations_errors = {s['_operations_error'] for s in tmp}
-        labels_errors = {s['_labels_error'] for s in tmp}
-        errors = list(filter(None, operations_errors.union(labels_errors)))
-
-        if errors:
+        if stream and (dump_json or (detailed and (expand or not unroll))):
             logger.warning(
-                "Some job status updates did not succeed due to errors. "
-                "Number of unique errors: {}. Use --debug to list all errors.".format(len(errors)))
-            for i, error in enumerate(errors):
-                logger.debug("Status update error #{}: '{}'".format(i+1, error))
-
-        if only_incomplete:
-            # Remove all jobs from the status info, that have not a single
-            # eligible operation.
+                "Streaming of the status is not supported in combination with the "
+                "--json, --expand, or --stack options and will be ignored.")
+            stream = False
 
-            def _incomplete(s):
-                return any(op['eligible'] for op in s['operations'].values())
+        def _log_errors(errors):
+            if errors:
+                logger.warning(
+                    "Some job status updates did not succeed due to errors. "
+                    "Number of unique errors: {}. Use --debug to list all "
+                    "errors.".format(len(errors)))
+                for i, error in enumerate(errors):
+                    logger.debug("Status update error #{}: '{}'".format(i+1, error))
 
-            tmp = list(filter(_incomplete, tmp))
+        def _errors(status):
+            return set(filter(None, (status['_operations_error'], status['_labels_error'])))
 
-        statuses = OrderedDict([(s['job_id'], s) for s in tmp])
+        def _incomplete(s):
+            return any(op['eligible'] for op in s['operations'].values())
 
-        # If the dump_json variable is set, just dump all status info
-        # formatted in JSON to screen.
-        if dump_json:
-            print(json.dumps(statuses, indent=4), file=file)
-            return
+        def _count_labels(progress, status):
+            for label in status['labels']:
+                progress[label] += 1
 
-        # Generate status overview:
-        if overview:
+        def _print_overview(progress, num_jobs):
             print("# Overview:", file=file)
-            print("{} {}\n".format(self._tr("Total # of jobs:"), len(statuses), file=file))
+            print("{} {}\n".format(self._tr("Total # of jobs:"), num_jobs), file=file)
 
             # Draw progress bars
-            progress = defaultdict(int)
-            for status in statuses.values():
-                for label in status['labels']:
-                    progress[label] += 1
             progress_sorted = list(islice(
                 sorted(progress.items(), key=lambda x: (x[1], x[0]), reverse=True),
                 overview_max_lines))
             rows = [[
                 label,
-                '{} {:0.2f}%'.format(draw_progressbar(num, len(statuses)),
-                                     100 * num / len(statuses))
+                '{} {:0.2f}%'.format(draw_progressbar(num, num_jobs),
+                                     100 * num / num_jobs)
             ]
                 for label, num in progress_sorted]
 
@@ -1145,6 +1947,38 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                 if lines_skipped > 0:
                     print(self._tr("Lines omitted:"), lines_skipped, file=file)
 
+        if stream:
+            tmp = self._iter_status(jobs, err, ignore_errors, no_parallelize, parallel_backend)
+            if param_max_width is None:
+                param_max_width = self.STATUS_STREAM_PARAM_MAX_WIDTH
+        else:
+            tmp = self._fetch_status(jobs, err, ignore_errors, no_parallelize, parallel_backend)
+
+            errors = set()
+            for status in tmp:
+                errors.update(_errors(status))
+            _log_errors(list(errors))
+
+            if only_incomplete:
+                # Remove all jobs from the status info, that have not a single
+                # eligible operation.
+                tmp = list(filter(_incomplete, tmp))
+
+            statuses = OrderedDict([(s['job_id'], s) for s in tmp])
+
+            # If the dump_json variable is set, just dump all status info
+            # formatted in JSON to screen.
+            if dump_json:
+                print(json.dumps(statuses, indent=4), file=file)
+                return
+
+            # Generate status overview:
+            if overview:
+                progress = defaultdict(int)
+                for status in statuses.values():
+                    _count_labels(progress, status)
+                _print_overview(progress, len(statuses))
+
         # Generate detailed view:
         def _select_op(doc):
             active = JobStatus(doc['scheduler_status']) > JobStatus.unknown
@@ -1162,9 +1996,17 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                 return x
 
         # Optionally expand parameters argument to all varying parameters.
+        statepoints = dict()
         if parameters is self.PRINT_STATUS_ALL_VARYING_PARAMETERS:
-            parameters = list(sorted({key for job in jobs for key in job.sp.keys()
-                                      if len(set([job.sp.get(key) for job in jobs])) > 1}))
+            def _statepoints():
+                for job in jobs:
+                    sp = job.statepoint()
+                    # The statepoints are read again for each streamed row, such
+                    # that the memory usage does not grow with the number of jobs.
+                    if not stream:
+                        statepoints[job.get_id()] = sp
+                    yield sp
+            parameters = _varying_keys(_statepoints())
 
         if detailed:
             rows_status = []
@@ -1179,7 +2021,9 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                         i + offset, shorten(self._alias(str(value)), param_max_width))
 
             def _format_status(status):
-                sp = self.open_job(id=status['job_id']).statepoint()
+                sp = statepoints.get(status['job_id'])
+                if sp is None and parameters:
+                    sp = self.open_job(id=status['job_id']).statepoint()
 
                 def get(k, m):
                     if m is None:
@@ -1230,6 +2074,53 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                 else:
                     yield row
 
+        if stream:
+            if detailed:
+                # The width of the operation column is determined by the longest operation name.
+                width_op = max([len(name) for name in self._operations] + [0])
+                width_op = max(len(header_detailed[1]), width_op + 4)
+                if compact:
+                    width_op += len(' (+{})'.format(len(self._operations)))
+                widths = [max(len(header_detailed[0]), 32), width_op]   # 32: length of a job id
+                widths.extend(max(len(h), param_max_width) for h in header_detailed[2:-1])
+
+                def _print_row(row):
+                    cells = ['' if cell is None else str(cell) for cell in row]
+                    print('  '.join(_ljust(cell, width) for cell, width in zip(cells, widths)) +
+                          '  ' + cells[-1], file=file)
+
+                print("# Detailed View:", file=file)
+                _print_row(header_detailed)
+                _print_row(['-' * width for width in widths] + ['-' * len(header_detailed[-1])])
+
+            errors = set()
+            progress = defaultdict(int)
+            num_jobs = 0
+            for status in tmp:
+                errors.update(_errors(status))
+                if only_incomplete and not _incomplete(status):
+                    continue
+                num_jobs += 1
+                _count_labels(progress, status)
+                if detailed:
+                    for row in _format_status(status):
+                        _print_row(row)
+                    file.flush()
+            _log_errors(list(errors))
+
+            if overview:
+                if detailed:
+                    print(file=file)
+                _print_overview(progress, num_jobs)
+            if detailed:
+                print(' '.join('[{}]:{}'.format(v, k) for k, v in self.ALIASES.items()), file=file)
+            if abbreviate.table:
+                print('\n', self._tr("Abbreviations used:"), file=file)
+                for a in sorted(abbreviate.table):
+                    print('{}: {}'.format(a, abbreviate.table[a]), file=file)
+            return
+
+        if detailed:
             for status in statuses.values():
                 rows_status.extend(_format_status(status))
 
@@ -1330,7 +2221,7 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                             _print_unicode(msg)
                 legend = u'Legend: ' + u' '.join(u'{}:{}'.format(v, k) for k, v in symbols.items())
                 _print_unicode(legend)
-            print(' '.join('[{}]:{}'.format(v, k) for k, v in self.ALIASES.items()))
+            print(' '.join('[{}]:{}'.format(v, k) for k, v in self.ALIASES.items()), file=file)
 
         # Show any abbreviations used
         if abbreviate.table:
@@ -1338,7 +2229,53 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             for a in sorted(abbreviate.table):
                 print('{}: {}'.format(a, abbreviate.table[a]), file=file)
 
-    def run_operations(self, operations=None, pretend=False, np=None, timeout=None, progress=False):
+    def print_stats(self, jobs=None, names=None, file=None):
+        """Print a summary of the resource usage of executed operations.
+
+        The wall time, CPU time, and peak resident set size (RSS) of each execution
+        of an operation are recorded if the configuration value `flow.record_stats`
+        is enabled, see :mod:`flow.util.stats`. The summary may be used to choose the
+        'walltime', 'np', and 'memory' directives of operations.
+
+        :param jobs:
+            Only summarize the executions for the given jobs, or all if the argument
+            is omitted.
+        :type jobs:
+            Sequence of instances :class:`.Job`.
+        :param names:
+            Only summarize the executions of operations that match the given names,
+            or all if the argument is omitted.
+        :type names:
+            Sequence of :class:`str`
+        :param file:
+            Redirect all output to this file, defaults to sys.stdout.
+        """
+        from .util import tabulate
+        if file is None:
+            file = sys.stdout
+        assert not isinstance(names, six.string_types)
+
+        records = load_stats(self._fn_stats())
+        if jobs is not None:
+            job_ids = {job.get_id() for job in jobs}
+            records = (r for r in records if r.job_id in job_ids)
+        if names is not None:
+            records = (r for r in records if any(fullmatch(n, r.name) for n in names))
+        summary = summarize_stats(records)
+        if not summary:
+            print("No operation stats recorded.", file=file)
+            return
+
+        keys = ['walltime_mean', 'walltime_max', 'cputime_mean', 'cputime_max', 'maxrss_max']
+        rows = [[name, entry['executions']] + [entry[key] for key in keys]
+                for name, entry in summary.items()]
+        headers = ['operation', 'executions', 'walltime mean [s]', 'walltime max [s]',
+                   'cputime mean [s]', 'cputime max [s]', 'peak RSS [MB]']
+        print(tabulate.tabulate(rows, headers=headers, floatfmt='.2f', missingval='-'),
+              file=file)
+
+    def run_operations(self, operations=None, pretend=False, np=None, timeout=None, progress=False,
+                       pack=False, ngpu=None, memory=None, asynchronous=False):
         """Execute the next operations as specified by the project's workflow.
 
         See also: :meth:`~.run`
@@ -1366,7 +2303,32 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             Show a progress bar during execution.
         :type progess:
             bool
+        :param pack:
+            Execute the operations concurrently, such that the processors, GPUs, and memory
+            requested with their 'np', 'ngpu', and 'memory' directives do not exceed the
+            available resources. The number of available processors is given by np and
+            defaults to all available processing units.
+        :type pack:
+            bool
+        :param ngpu:
+            The number of GPUs available for packed execution; GPUs are not considered
+            if this argument is None.
+        :type ngpu:
+            int
+        :param memory:
+            The memory in GB available for packed execution; defaults to the physical
+            memory of this machine.
+        :type memory:
+            float
+        :param asynchronous:
+            Execute the commands of the operations as asynchronous subprocesses of this
+            process, see :meth:`~._run_operations_asynchronously`. The number of concurrently
+            executed commands is given by np and defaults to the number of available
+            processing units. Requires Python 3.5 or higher.
+        :type asynchronous:
+            bool
         """
+        from .util.tqdm import tqdm
         if six.PY2 and timeout is not None:
             logger.warning(
                 "The timeout argument for run() is not supported for "
@@ -1378,7 +2340,21 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         else:
             operations = list(operations)   # ensure list
 
-        if np is None or np == 1 or pretend:
+        if pack and asynchronous:
+            raise ValueError("The pack and asynchronous arguments cannot be combined.")
+        if asynchronous and not pretend:
+            self._run_operations_asynchronously(
+                cpu_count() if np is None or np < 0 else np, operations, progress, timeout)
+        elif pack and not pretend:
+            if memory is None:
+                memory = _physical_memory()
+            resources = (cpu_count() if np is None or np < 0 else np, ngpu, memory)
+            logger.debug("Packed execution of {} operation(s) with {} processors, "
+                         "{} GPUs, and {} GB of memory.".format(len(operations), *resources))
+            self._call_with_serialization(
+                lambda pickle: self._run_operations_packed(
+                    pickle, operations, resources, progress, timeout))
+        elif np is None or np == 1 or pretend:
             if progress:
                 operations = tqdm(operations)
             for operation in operations:
@@ -1388,36 +2364,46 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                     self._fork(operation, timeout)
         else:
             logger.debug("Parallelized execution of {} operation(s).".format(len(operations)))
-            with contextlib.closing(Pool(processes=cpu_count() if np < 0 else np)) as pool:
-                logger.debug("Parallelized execution of {} operation(s).".format(len(operations)))
-                try:
-                    from six.moves import cPickle as pickle
-                    self._run_operations_in_parallel(pool, pickle, operations, progress, timeout)
-                    logger.debug("Used cPickle module for serialization.")
-                except Exception as error:
-                    if not isinstance(error, (pickle.PickleError, self._PickleError)) and\
-                            'pickle' not in str(error).lower():
-                        raise    # most likely not a pickle related error...
-
-                    try:
-                        import cloudpickle
-                    except ImportError:  # The cloudpickle package is not available.
-                        logger.error("Unable to parallelize execution due to a pickling error. "
-                                     "\n\n - Try to install the 'cloudpickle' package, e.g., with "
-                                     "'pip install cloudpickle'!\n")
-                        raise error
-                    else:
-                        try:
-                            self._run_operations_in_parallel(
-                                pool, cloudpickle, operations, progress, timeout)
-                        except self._PickleError as error:
-                            raise RuntimeError("Unable to parallelize execution due to a pickling "
-                                               "error: {}.".format(error))
+            self._call_with_serialization(
+                lambda pickle: self._run_operations_in_parallel(
+                    cpu_count() if np < 0 else np, pickle, operations, progress, timeout))
 
     class _PickleError(Exception):
         "Indicates a pickling error while trying to parallelize the execution of operations."
         pass
 
+    def _call_with_serialization(self, func):
+        """Call func with the most appropriate serialization module as its only argument.
+
+        The function is first called with the cPickle module and then once more with
+        the cloudpickle module in case that the first attempt failed due to a pickling
+        error, which is likely, since the project instance usually contains functions
+        that cannot be pickled with the standard pickle module.
+        """
+        from signac.common.six.moves import cPickle as pickle
+        try:
+            result = func(pickle)
+            logger.debug("Used cPickle module for serialization.")
+            return result
+        except Exception as error:
+            if not isinstance(error, (pickle.PickleError, self._PickleError)) and\
+                    'pickle' not in str(error).lower():
+                raise    # most likely not a pickle related error...
+
+            try:
+                import cloudpickle
+            except ImportError:  # The cloudpickle package is not available.
+                logger.error("Unable to parallelize execution due to a pickling error. "
+                             "\n\n - Try to install the 'cloudpickle' package, e.g., with "
+                             "'pip install cloudpickle'!\n")
+                raise error
+            else:
+                try:
+                    return func(cloudpickle)
+                except self._PickleError as error:
+                    raise RuntimeError("Unable to parallelize execution due to a pickling "
+                                       "error: {}.".format(error))
+
     @staticmethod
     def _dumps_op(op):
         return (op.name, op.job._id, op.cmd, op.directives)
@@ -1426,27 +2412,117 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         name, job_id, cmd, directives = blob
         return JobOperation(name, self.open_job(id=job_id), cmd, directives)
 
-    def _run_operations_in_parallel(self, pool, pickle, operations, progress, timeout):
+    def _run_operations_in_parallel(self, processes, pickle, operations, progress, timeout):
         """Execute operations in parallel.
 
-        This function executes the given list of operations with the provided process pool.
+        This function executes the given list of operations with a process pool of the
+        given size.
 
         Since pickling of the project instance is likely to fail, we manually pickle the
-        project instance and the operations before submitting them to the process pool to
-        enable us to try different pool and pickle module combinations.
+        project instance before creating the process pool to enable us to try different
+        pickle modules. Each worker process unpickles the project instance once, such that
+        the tasks only consist of the serialized operations. The operations are dispatched
+        in chunks unless a timeout is provided, which applies to each operation.
+        """
+        from .util.tqdm import tqdm
+
+        try:
+            s_project = pickle.dumps(self)
+        except Exception as error:  # Masking all errors since they must be pickling related.
+            raise self._PickleError(error)
+        tasks = [self._dumps_op(op) for op in operations]
+        chunksize = 1 if timeout is not None else max(1, len(tasks) // (4 * processes))
+
+        pool = Pool(processes, _init_worker_with_serialization, (pickle.loads, s_project))
+        with contextlib.closing(pool):
+            results = pool.imap_unordered(_fork_in_worker, tasks, chunksize)
+            for _ in tqdm(tasks) if progress else tasks:
+                results.next(timeout)
+
+    def _run_operations_packed(self, pickle, operations, resources, progress, timeout):
+        """Execute operations in parallel within the given resources.
+
+        The resources are the number of available processors, GPUs, and the memory in GB;
+        GPUs and memory are not considered if None. The operations are started in order
+        of decreasing requested resources, see :func:`~._requested_resources`, as soon
+        as the requested resources are available, such that smaller operations are
+        started while larger operations wait for resources to be released. An operation
+        that requests more resources than available is only started while no other
+        operation is executed. See :meth:`~._run_operations_in_parallel` for details
+        on the serialization of the project instance.
         """
+        from .util.tqdm import tqdm
 
         try:
             s_project = pickle.dumps(self)
-            s_tasks = [(pickle.loads, s_project, self._dumps_op(op))
-                       for op in with_progressbar(operations, desc='Serialize tasks')]
         except Exception as error:  # Masking all errors since they must be pickling related.
             raise self._PickleError(error)
 
-        results = [pool.apply_async(_fork_with_serialization, task) for task in s_tasks]
+        # Each operation occupies one worker process of the pool.
+        processes = max(1, min(len(operations), int(resources[0])))
+        available = [processes] + list(resources)
+        waiting = sorted(operations, key=_requested_resources, reverse=True)
+        running = defaultdict(list)     # The requested resources by serialized name and job id.
+        tasks = six.moves.queue.Queue()
+
+        def _tasks():
+            for task in iter(tasks.get, None):
+                yield task
+
+        def _dispatch():
+            for operation in list(waiting):
+                request = _requested_resources(operation)
+                if running and not all(free is None or free >= requested
+                                       for free, requested in zip(available, request)):
+                    continue
+                for i, requested in enumerate(request):
+                    if available[i] is not None:
+                        available[i] -= requested
+                task = self._dumps_op(operation)
+                running[task[:2]].append(request)
+                waiting.remove(operation)
+                tasks.put(task)
+
+        pool = Pool(processes, _init_worker_with_serialization, (pickle.loads, s_project))
+        with contextlib.closing(pool):
+            try:
+                _dispatch()
+                results = pool.imap_unordered(_fork_in_worker, _tasks())
+                for _ in tqdm(operations) if progress else operations:
+                    key = tuple(results.next(timeout)[:2])
+                    request = running[key].pop()
+                    if not running[key]:
+                        del running[key]
+                    for i, requested in enumerate(request):
+                        if available[i] is not None:
+                            available[i] += requested
+                    _dispatch()
+            finally:
+                tasks.put(None)     # Stop the dispatch of tasks.
 
-        for result in tqdm(results) if progress else results:
-            result.get(timeout=timeout)
+    def _run_operations_asynchronously(self, processes, operations, progress, timeout):
+        """Execute the commands of operations as asynchronous subprocesses.
+
+        All operations are executed by forking their command, including operations
+        that are defined as Python functions, such that shell commands that mostly
+        wait for I/O do not occupy one worker process each. At most processes
+        commands are executed concurrently and their output is forwarded line by line.
+        """
+        if sys.version_info < (3, 5):
+            raise RuntimeError(
+                "The asynchronous execution of operations requires Python 3.5 or higher.")
+        from .util.async_execution import run_commands
+        from .util.tqdm import tqdm
+
+        logger.debug("Asynchronous execution of {} operation(s).".format(len(operations)))
+        if progress:
+            progressbar = tqdm(total=len(operations))
+        try:
+            run_commands([self._recorded_cmd(op) for op in operations], processes, timeout,
+                         progressbar.update if progress else None)
+        finally:
+            if progress:
+                progressbar.close()
 
     def _fork(self, operation, timeout=None):
         logger.info("Execute operation '{}'...".format(operation))
@@ -1455,12 +2531,18 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         if timeout is None and operation.name in self._operation_functions and \
                 operation.directives.get('executable', sys.executable) == sys.executable:
             logger.debug("Able to optimize execution of operation '{}'.".format(operation))
-            self._operation_functions[operation.name](operation.job)
-        else:   # need to fork
+            with self._recorded(operation.name, operation.job):
+                self._operation_functions[operation.name](operation.job)
+        elif operation.name in self._operation_functions:
+            # The operation is executed with the 'exec' command, which records its usage.
             fork(cmd=operation.cmd, timeout=timeout)
+        else:   # need to fork
+            with self._recorded(operation.name, operation.job) as record_usage:
+                record_usage(fork(cmd=operation.cmd, timeout=timeout))
 
     def run(self, jobs=None, names=None, pretend=False, np=None, timeout=None, num=None,
-            num_passes=1, progress=False):
+            num_passes=1, progress=False, dataflow=False, pack=False, ngpu=None, memory=None,
+            asynchronous=False):
         """Execute all pending operations for the given selection.
 
         This function will run in an infinite loop until all pending operations
@@ -1512,7 +2594,33 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             Show a progress bar during execution.
         :type progess:
             bool
+        :param dataflow:
+            Execute operations as soon as they become eligible instead of executing
+            them in passes, see :meth:`~._run_dataflow`.
+        :type dataflow:
+            bool
+        :param pack:
+            Execute the operations of each pass concurrently within the available
+            resources, see :meth:`~.run_operations`. Cannot be combined with dataflow.
+        :type pack:
+            bool
+        :param ngpu:
+            The number of GPUs available for packed execution.
+        :type ngpu:
+            int
+        :param memory:
+            The memory in GB available for packed execution.
+        :type memory:
+            float
+        :param asynchronous:
+            Execute the commands of the operations of each pass as asynchronous
+            subprocesses, see :meth:`~.run_operations`. Cannot be combined with dataflow.
+        :type asynchronous:
+            bool
         """
+        if dataflow and (pack or asynchronous):
+            raise ValueError(
+                "The dataflow argument cannot be combined with the pack or asynchronous argument.")
         # If no jobs argument is provided, we run operations for all jobs.
         if jobs is None:
             jobs = self
@@ -1572,25 +2680,142 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         # Note: We are not using sum(select.num_execution.values()) for efficiency.
         select.total_execution_count = 0
 
-        for i_pass in count(1):
-            if reached_execution_limit.is_set():
-                logger.warning("Reached the maximum number of operations that can be executed, but "
-                               "there are still operations pending.")
-                break
+        def pending(jobs):
+            "Return the selected pending operations for jobs."
             try:
                 with self._potentially_buffered():
-                    operations = list(filter(select, self._get_pending_operations(jobs, names)))
+                    return list(filter(select, self._get_pending_operations(jobs, names)))
             finally:
                 if messages:
                     for msg, level in set(messages):
                         logger.log(level, msg)
                     del messages[:]     # clear
-            if not operations:
-                break   # No more pending operations or execution limits reached.
-            logger.info(
-                "Executing {} operation(s) (Pass # {:02d})...".format(len(operations), i_pass))
-            self.run_operations(operations, pretend=pretend,
-                                np=np, timeout=timeout, progress=progress)
+
+        if dataflow:
+            self._run_dataflow(jobs, pending, pretend=pretend,
+                               np=np, timeout=timeout, progress=progress)
+        else:
+            for i_pass in count(1):
+                if reached_execution_limit.is_set():
+                    break
+                operations = pending(jobs)
+                if not operations:
+                    break   # No more pending operations or execution limits reached.
+                logger.info(
+                    "Executing {} operation(s) (Pass # {:02d})...".format(len(operations), i_pass))
+                self.run_operations(operations, pretend=pretend,
+                                    np=np, timeout=timeout, progress=progress,
+                                    pack=pack, ngpu=ngpu, memory=memory,
+                                    asynchronous=asynchronous)
+        if reached_execution_limit.is_set():
+            logger.warning("Reached the maximum number of operations that can be executed, but "
+                           "there are still operations pending.")
+
+    def _run_dataflow(self, jobs, pending, pretend=False, np=None, timeout=None, progress=False):
+        """Execute operations as soon as they become eligible.
+
+        Initially, all pending operations of jobs are queued for execution. Once all
+        queued operations of a job have been executed, only the operations of that job
+        are determined again and newly pending operations are queued immediately, while
+        the operations of other jobs are still executed. That means each job proceeds
+        in passes of its own. The operations of all jobs are only determined again once
+        all queued operations were executed, to account for operations that modify
+        other jobs.
+
+        :param pending:
+            A function that returns the pending operations for a sequence of jobs.
+        """
+        if pretend:
+            for operation in pending(jobs):
+                print(operation.cmd)
+            return
+        if timeout is not None and timeout < 0:
+            timeout = None
+
+        if progress:
+            from .util.tqdm import tqdm
+            progressbar = tqdm(desc='Execute operations')
+        if np is None or np == 1:
+            queue = deque()
+            num_queued = defaultdict(int)   # The number of queued operations per job.
+
+            def _queue(operations):
+                for operation in operations:
+                    num_queued[operation.job] += 1
+                    queue.append(operation)
+
+            while True:
+                _queue(pending(jobs))
+                if not queue:
+                    break
+                while queue:
+                    operation = queue.popleft()
+                    self._fork(operation, timeout)
+                    if progress:
+                        progressbar.update()
+                    num_queued[operation.job] -= 1
+                    if not num_queued[operation.job]:
+                        _queue(self._pending_for_job(pending, operation.job))
+        else:
+            self._call_with_serialization(
+                lambda pickle: self._run_dataflow_in_parallel(
+                    cpu_count() if np < 0 else np, pickle, jobs, pending, timeout,
+                    progressbar.update if progress else None))
+        if progress:
+            progressbar.close()
+
+    def _run_dataflow_in_parallel(self, processes, pickle, jobs, pending, timeout, callback):
+        """Execute operations as soon as they become eligible with a process pool.
+
+        See :meth:`~._run_dataflow` and :meth:`~._run_operations_in_parallel`.
+        The operations are passed to the pool through a queue, such that newly
+        pending operations are dispatched while other operations are still executed.
+        """
+        try:
+            s_project = pickle.dumps(self)
+        except Exception as error:  # Masking all errors since they must be pickling related.
+            raise self._PickleError(error)
+
+        tasks = six.moves.queue.Queue()
+        queued = dict()     # The queued operations by their serialized name and job id.
+        num_queued = defaultdict(int)   # The number of queued operations per job.
+
+        def _tasks():
+            for task in iter(tasks.get, None):
+                yield task
+
+        def _queue(operations):
+            for operation in operations:
+                task = self._dumps_op(operation)
+                queued[task[:2]] = operation
+                num_queued[operation.job] += 1
+                tasks.put(task)
+
+        pool = Pool(processes, _init_worker_with_serialization, (pickle.loads, s_project))
+        with contextlib.closing(pool):
+            try:
+                _queue(pending(jobs))
+                results = pool.imap_unordered(_fork_in_worker, _tasks())
+                while queued:
+                    operation = queued.pop(tuple(results.next(timeout)[:2]))
+                    if callback is not None:
+                        callback()
+                    num_queued[operation.job] -= 1
+                    if not num_queued[operation.job]:
+                        _queue(self._pending_for_job(pending, operation.job))
+                    if not queued:
+                        _queue(pending(jobs))
+            finally:
+                tasks.put(None)     # Stop the dispatch of tasks.
+
+    def _pending_for_job(self, pending, job):
+        """Return the pending operations for job, if the job still exists.
+
+        A job may cease to exist, e.g., because its state point was changed by one
+        of its operations. Such jobs are picked up again once the operations of all
+        jobs are determined.
+        """
+        return pending([job]) if job in self else []
 
     def _generate_operations(self, cmd, jobs, requires=None):
         "Generate job-operations for a given 'direct' command."
@@ -1601,11 +2826,17 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             yield JobOperation(name=cmd_.replace(' ', '-'), cmd=cmd_, job=job)
 
     def _get_pending_operations(self, jobs, operation_names=None):
-        "Get all pending operations for the given selection."
+        """Get the list of all pending operations for the given selection.
+
+        The condition values are memoized while the operations are determined,
+        which is why all operations are determined before any of them is executed.
+        """
         assert not isinstance(operation_names, six.string_types)
-        for op in self.next_operations(* jobs):
-            if operation_names is None or any(fullmatch(n, op.name) for n in operation_names):
-                yield op
+        jobs = list(jobs)
+        with self._conditions_cached(jobs):
+            return [op for op in self._job_operations(jobs, True)
+                    if operation_names is None or
+                    any(fullmatch(n, op.name) for n in operation_names)]
 
     @contextlib.contextmanager
     def _potentially_buffered(self):
@@ -1676,15 +2907,25 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         context['base_script'] = env.template
         context['environment'] = env.__name__
         context['id'] = _id
-        context['operations'] = list(operations)
+        context['operations'] = [self._recorded_operation(op) for op in operations]
         context.update(kwargs)
         if show_template_help:
             self._show_template_help_and_exit(template_environment, context)
         return template.render(** context)
 
+    def _recorded_operation(self, operation):
+        "Return operation with the command returned by :meth:`~._recorded_cmd`."
+        cmd = self._recorded_cmd(operation)
+        if cmd == operation.cmd:
+            return operation
+        recorded_operation = JobOperation(operation.name, operation.job, cmd)
+        # The directives are shared, such that their use by the template is tracked.
+        recorded_operation.directives = operation.directives
+        return recorded_operation
+
     def submit_operations(self, operations, _id=None, env=None, parallel=False, flags=None,
                           force=False, template='script.sh', pretend=False,
-                          show_template_help=False, **kwargs):
+                          show_template_help=False, job_array=False, **kwargs):
         """Submit a sequence of operations to the scheduler.
 
         .. versionchanged:: 0.6
@@ -1722,15 +2963,33 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             Show information about available template variables and filters and exit.
         :type show_template_help:
             bool
+        :param job_array:
+            Submit the operations as one job array with one task per operation
+            instead of executing all operations within one cluster job.
+        :type job_array:
+            bool
         :param kwargs:
             Additional keyword arguments to be forwarded to the scheduler.
         :return:
             Return the submission status after successful submission or None.
         """
-        if _id is None:
-            _id = self._store_bundled(operations)
         if env is None:
             env = self._environment
+        if job_array and len(operations) > 1:
+            scheduler_type = env.scheduler_type
+            if getattr(scheduler_type, 'array_task_id_var', None) is None:
+                raise SubmitError(
+                    "Unable to submit job array, because job arrays are not supported "
+                    "by the scheduler of the environment '{}'.".format(env.__name__))
+            if _id is None:
+                _id = self._store_job_array(operations, scheduler_type.array_task_id_offset)
+            kwargs['array'] = dict(
+                task_id_var=scheduler_type.array_task_id_var,
+                task_id_offset=scheduler_type.array_task_id_offset,
+                num_tasks=len(operations))
+            parallel = False    # each task executes exactly one operation
+        if _id is None:
+            _id = self._store_bundled(operations)
 
         print("Submitting cluster job '{}':".format(_id), file=sys.stderr)
 
@@ -1772,10 +3031,41 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             if pretend:
                 print(script)
             else:
-                return env.submit(_id=_id, script=script, flags=flags, **kwargs)
+                kwargs.pop('array', None)
+                status = env.submit(_id=_id, script=script, flags=flags, **kwargs)
+                if status is not None:
+                    self._scheduler_snapshot.add(_id, status)
+                return status
+
+    def _make_bundles(self, operations, bundle_size=1, bundle_nodes=None, env=None,
+                      job_array=False):
+        """Bundle operations by size or pack them to fill the given number of nodes.
+
+        If job_array is True, the operations are instead grouped into job arrays.
+        The bundle size and the number of nodes are mutually exclusive.
+        """
+        if env is None:
+            env = self._environment
+        if job_array:
+            if bundle_size != 1 or bundle_nodes is not None:
+                raise ValueError("Job arrays can not be combined with bundling.")
+            return make_job_arrays(
+                operations, getattr(env.scheduler_type, 'array_max_size', None))
+        if bundle_nodes is None:
+            return make_bundles(operations, bundle_size)
+        if bundle_size != 1:
+            raise ValueError("Bundling by size can not be combined with bundling by nodes.")
+        cores_per_node = getattr(env, 'cores_per_node', None)
+        if not cores_per_node:
+            raise ValueError(
+                "Unable to bundle operations by nodes, because the number of cores per "
+                "node is not defined for the environment '{}'.".format(env.__name__))
+        return make_packed_bundles(
+            operations, bundle_nodes, cores_per_node, getattr(env, 'gpus_per_node', None))
 
     def submit(self, bundle_size=1, jobs=None, names=None, num=None, parallel=False,
-               force=False, walltime=None, env=None, **kwargs):
+               force=False, walltime=None, env=None, bundle_nodes=None,
+               num_workers=None, max_submit_rate=None, job_array=False, **kwargs):
         """Submit function for the project's main submit interface.
 
         .. versionchanged:: 0.6
@@ -1806,6 +3096,27 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             bool
         :param walltime:
             Specify the walltime in hours or as instance of datetime.timedelta.
+        :param bundle_nodes:
+            Pack operations into bundles that fill the given number of nodes
+            based on their 'np', 'ngpu', and 'walltime' directives instead of
+            bundling them by size; can not be combined with a bundle_size other
+            than 1. Implies parallel execution.
+        :type bundle_nodes:
+            int
+        :param num_workers:
+            Generate the scripts for and submit multiple bundles concurrently with
+            the given number of threads. By default, bundles are submitted one by one.
+        :type num_workers:
+            int
+        :param max_submit_rate:
+            Limit the number of cluster job submissions per second.
+        :type max_submit_rate:
+            float
+        :param job_array:
+            Submit operations with the same name and directives as one job array
+            with one task per operation. Can not be combined with bundling.
+        :type job_array:
+            bool
         """
         # Regular argument checks and expansion
         if jobs is None:
@@ -1831,16 +3142,75 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             if num is not None:
                 operations = list(islice(operations, num))
 
+        if bundle_nodes is not None:
+            parallel = True
+
         # Bundle them up and submit.
-        for bundle in make_bundles(operations, bundle_size):
-            status = self.submit_operations(
-                operations=bundle, env=env, parallel=parallel,
-                force=force, walltime=walltime, **kwargs)
+        self._submit_bundles(
+            self._make_bundles(operations, bundle_size, bundle_nodes, env, job_array),
+            num_workers=num_workers, max_submit_rate=max_submit_rate, job_array=job_array,
+            env=env, parallel=parallel, force=force, walltime=walltime, **kwargs)
+
+    def _submit_bundles(self, bundles, num_workers=None, max_submit_rate=None, **kwargs):
+        """Submit each bundle of operations and store the status of all submitted operations.
+
+        The bundles are submitted concurrently if num_workers is larger than one, in
+        which case the output of each submission is printed once it completed, in the
+        order of the bundles. All status updates are written at once, including those
+        of bundles that were submitted successfully when the submission of another
+        bundle failed.
+        """
+        rate_limiter = None if max_submit_rate is None else _RateLimiter(max_submit_rate)
+
+        def _submit(bundle):
+            if rate_limiter is not None:
+                rate_limiter.wait()
+            return self.submit_operations(operations=bundle, **kwargs)
 
+        def _store_status(bundle, status):
             if status is not None:  # operations were submitted, store status
                 for op in bundle:
                     op.set_status(status)
 
+        with self._buffered_status_updates():
+            if num_workers is None or num_workers <= 1:
+                for bundle in bundles:
+                    _store_status(bundle, _submit(bundle))
+            else:
+                # The output of the submissions is captured per thread, such that the
+                # output of concurrent submissions is not interleaved.
+                stdout, stderr = sys.stdout, sys.stderr
+                sys.stdout, sys.stderr = _ThreadLocalStream(stdout), _ThreadLocalStream(stderr)
+
+                def _submit_captured(bundle, output):
+                    with sys.stdout.capture(output[0]):
+                        with sys.stderr.capture(output[1]):
+                            return _submit(bundle)
+
+                pool = ThreadPool(num_workers)
+                try:
+                    results = []
+                    for bundle in bundles:
+                        output = six.StringIO(), six.StringIO()
+                        results.append((bundle, output, pool.apply_async(
+                            _submit_captured, (bundle, output))))
+                    error = None
+                    for bundle, output, result in results:
+                        try:
+                            _store_status(bundle, result.get())
+                        except Exception as e:
+                            if error is None:
+                                error = e
+                        finally:
+                            stderr.write(output[1].getvalue())
+                            stdout.write(output[0].getvalue())
+                    if error is not None:
+                        raise error
+                finally:
+                    pool.close()
+                    pool.join()
+                    sys.stdout, sys.stderr = stdout, stderr
+
     @classmethod
     def _add_submit_args(cls, parser):
         "Add arguments to submit sub command to parser."
@@ -1861,6 +3231,15 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             '--test',
             action='store_true',
             help="Do not interact with the scheduler, implies --pretend.")
+        parser.add_argument(
+            '--num-workers',
+            type=_positive_int,
+            help="Generate the scripts for and submit multiple bundles concurrently "
+                 "with the given number of threads.")
+        parser.add_argument(
+            '--max-submit-rate',
+            type=float,
+            help="Limit the number of cluster job submissions per second.")
         cls._add_operation_selection_arg_group(parser)
         cls._add_operation_bundling_arg_group(parser)
         cls._add_template_arg_group(parser)
@@ -1959,6 +3338,17 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             help="Bundle multiple operations for execution. When this "
                  "option is provided without argument, all pending operations "
                  "are aggregated into one bundle.")
+        bundling_group.add_argument(
+            '--bundle-nodes',
+            type=_positive_int,
+            help="Pack operations into bundles that fill the given number of nodes "
+                 "based on their np, ngpu, and walltime directives instead of bundling them "
+                 "by size; can not be combined with -b/--bundle. Implies --parallel.")
+        bundling_group.add_argument(
+            '--job-array',
+            action='store_true',
+            help="Submit operations with the same name and directives as one job array "
+                 "with one task per operation instead of bundling them.")
         bundling_group.add_argument(
             '-p', '--parallel',
             action='store_true',
@@ -2039,6 +3429,11 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         view_group.add_argument(
             '--pretty',
             action='store_true')
+        view_group.add_argument(
+            '--stream',
+            action='store_true',
+            help="Print the detailed view row by row as soon as the status of "
+                 "each job has been determined.")
         view_group.add_argument(
             '--full',
             action='store_true',
@@ -2070,6 +3465,11 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             '--no-parallelize',
             action='store_true',
             help="Do not parallelize the status determination.")
+        parser.add_argument(
+            '--parallel-backend',
+            choices=['process', 'thread', 'serial'],
+            help="Determine the status of jobs with a process pool, a thread pool, "
+                 "or in serial. Defaults to 'thread' unless --no-parallelize is provided.")
 
     def labels(self, job):
         """Yields all labels for the given ``job``.
@@ -2198,17 +3598,66 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             if op.complete(job):
                 yield name
 
+    @contextlib.contextmanager
+    def _conditions_cached(self, jobs):
+        """Memoize the values of all conditions within this context.
+
+        Each condition is evaluated at most once per job within this context,
+        even if it is used by multiple operations, e.g., via :meth:`~.pre.after`.
+        All batch conditions are evaluated for jobs upfront.
+        The context should therefore only enclose the evaluation of conditions,
+        but not the execution of operations, which may change their values. In
+        particular, it must not be held open by generators that yield to callers,
+        which may execute the yielded operations.
+
+        This context has no effect if entered within an outer context.
+        The number of cache hits and misses is logged upon exit and stored
+        in the `_condition_cache_info` attribute for debugging purposes.
+        """
+        if self._condition_cache is not None:
+            yield
+            return
+        callbacks = set()
+        for op in self._operations.values():
+            callbacks.update(op.batch_callbacks())
+        if callbacks:
+            cache = _ConditionCache(FlowCondition.evaluate_batch(callbacks, list(jobs)))
+        else:
+            cache = _ConditionCache()
+        self._condition_cache = cache
+        try:
+            yield
+        finally:
+            self._condition_cache = None
+            self._condition_cache_info = cache.info()
+            logger.debug("Condition cache: {hits} hit(s), {misses} miss(es).".format(
+                **self._condition_cache_info))
+
     def _job_operations(self, jobs, only_eligible):
-        "Yield instances of JobOperation constructed for specific jobs."
+        """Yield instances of JobOperation constructed for specific jobs.
+
+        The eligible operations of each job are yielded in dependency order, see
+        :meth:`~._operations_in_dependency_order`, all others in definition order.
+        """
+        if only_eligible and self._operation_graph:
+            names = self._operations_in_dependency_order()
+        else:
+            names = list(self._operations)
         for job in jobs:
-            for name, op in self.operations.items():
-                if only_eligible and not op.eligible(job):
+            for name in names:
+                op = self._operations[name]
+                if only_eligible and not op.eligible(job, self._condition_cache):
                     continue
                 yield JobOperation(name=name, job=job, cmd=op(job), directives=op.directives)
 
     def next_operations(self, *jobs):
         """Determine the next eligible operations for jobs.
 
+        The operations are determined lazily, such that operations that are
+        executed while iterating affect the eligibility of subsequent operations.
+        Condition values are therefore not memoized and batch conditions are
+        evaluated for each job individually.
+
         :param jobs:
             The signac job handles.
         :type job:
@@ -2311,11 +3760,45 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             # Construct FlowOperation:
             if getattr(func, '_flow_cmd', False):
                 self._operations[name] = FlowOperation(cmd=func, **params)
+                self._operation_exec_cmds[name] = _guess_cmd(func, name)
             else:
                 self._operations[name] = FlowOperation(
                     cmd=_guess_cmd(func, name, **params), **params)
                 self._operation_functions[name] = func
 
+        # Construct the dependency graph of operations that are declared with pre.after().
+        names = defaultdict(list)
+        for name, func in operations:
+            names[func].append(name)
+        for name, op in self._operations.items():
+            upstream = [up for func in op.upstream() for up in names.get(func, [])]
+            if upstream:
+                self._operation_graph[name] = upstream
+
+    def _operations_in_dependency_order(self):
+        """Return the names of all operations in topological order.
+
+        Operations always appear after all operations they depend on via
+        :meth:`~.pre.after`, otherwise the order of definition is preserved.
+        Operations that are part of a dependency cycle are appended at the end.
+        """
+        order = []
+        visited = set()
+        remaining = list(self._operations)
+        while remaining:
+            deferred = []
+            for name in remaining:
+                if all(up in visited for up in self._operation_graph.get(name, ())):
+                    order.append(name)
+                    visited.add(name)
+                else:
+                    deferred.append(name)
+            if len(deferred) == len(remaining):     # dependency cycle
+                order.extend(deferred)
+                break
+            remaining = deferred
+        return order
+
     @property
     def operations(self):
         "The dictionary of operations that have been added to the workflow."
@@ -2358,6 +3841,14 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             if show_traceback:
                 raise
 
+    def _main_stats(self, args):
+        "Print a summary of the resource usage of executed operations."
+        if args.job_id or args.filter or args.doc_filter:
+            jobs = self._select_jobs_from_args(args)
+        else:
+            jobs = None     # Include the executions for jobs that no longer exist.
+        self.print_stats(jobs=jobs, names=args.operation_name)
+
     def _main_next(self, args):
         "Determine the jobs that are eligible for a specific operation."
         for job in self:
@@ -2387,7 +3878,10 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         run = functools.partial(self.run,
                                 jobs=jobs, names=args.operation_name, pretend=args.pretend,
                                 np=args.parallel, timeout=args.timeout, num=args.num,
-                                num_passes=args.num_passes, progress=args.progress)
+                                num_passes=args.num_passes, progress=args.progress,
+                                dataflow=args.dataflow, pack=args.pack,
+                                ngpu=args.ngpu, memory=args.memory,
+                                asynchronous=args.asynchronous)
 
         if args.switch_to_project_root:
             with add_cwd_to_environment_pythonpath():
@@ -2438,12 +3932,15 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             ops = self._get_pending_operations(jobs, args.operation_name)
             ops = list(islice(ops, args.num))
 
+        if args.bundle_nodes is not None:
+            kwargs['parallel'] = True
+
         # Bundle operations up, generate the script, and submit to scheduler.
-        for bundle in make_bundles(ops, args.bundle_size):
-            status = self.submit_operations(operations=bundle, **kwargs)
-            if status is not None:
-                for op in bundle:
-                    op.set_status(status)
+        self._submit_bundles(
+            self._make_bundles(ops, args.bundle_size, args.bundle_nodes,
+                               job_array=args.job_array),
+            num_workers=kwargs.pop('num_workers'),
+            max_submit_rate=kwargs.pop('max_submit_rate'), **kwargs)
 
     def _main_exec(self, args):
         if len(args.jobid):
@@ -2451,23 +3948,25 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         else:
             jobs = self
         try:
-            try:
-                operation_function = self._operation_functions[args.operation]
-            except KeyError:
-                operation = self._operations[args.operation]
-
-                def operation_function(job):
-                    cmd = operation(job).format(job=job)
-                    fork(cmd=cmd)
-
+            operation = self._operations[args.operation]
         except KeyError:
             raise KeyError("Unknown operation '{}'.".format(args.operation))
+        operation_function = self._operation_functions.get(args.operation)
 
-        if getattr(operation_function, '_flow_aggregate', False):
+        if operation_function is None:
+            for job in jobs:
+                with self._recorded(args.operation, job) as record_usage:
+                    cmd = operation(job).format(job=job)
+                    record_usage(fork(cmd=cmd))
+        elif getattr(operation_function, '_flow_aggregate', False):
             operation_function(jobs)
         else:
+            # The peak RSS of this process is only attributed to the
+            # operation if it is executed for a single job.
+            own_process = len(args.jobid) == 1
             for job in jobs:
-                operation_function(job)
+                with self._recorded(args.operation, job, own_process):
+                    operation_function(job)
 
     def _select_jobs_from_args(self, args):
         "Select jobs with the given command line arguments ('-j/-f/--doc-filter')."
@@ -2534,6 +4033,13 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
                 action='store_true',
                 help="This option implies `-vv --show-traceback`.")
 
+        # The subcommand is determined before the subparsers are added, such that the
+        # environment is only detected when its options are needed by the submit command.
+        subcommand_parser = argparse.ArgumentParser(add_help=False, parents=[parser])
+        subcommand_parser.add_argument('subcommand', nargs='?')
+        subcommand = subcommand_parser.parse_known_args(
+            [arg for arg in sys.argv[1:] if arg not in ('-h', '--help')])[0].subcommand
+
         subparsers = parser.add_subparsers()
 
         parser_status = subparsers.add_parser(
@@ -2542,6 +4048,19 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
         self._add_print_status_args(parser_status)
         parser_status.set_defaults(func=self._main_status)
 
+        parser_stats = subparsers.add_parser(
+            'stats',
+            parents=[base_parser],
+            description="Print a summary of the wall time, CPU time, and peak memory usage "
+                        "of executed operations.")
+        self._add_job_selection_args(parser_stats)
+        parser_stats.add_argument(
+            '-o', '--operation',
+            dest='operation_name',
+            nargs='+',
+            help="Only summarize operations that match the given operation name(s).")
+        parser_stats.set_defaults(func=self._main_stats)
+
         parser_next = subparsers.add_parser(
             'next',
             parents=[base_parser],
@@ -2596,6 +4115,35 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             const='-1',
             help="Specify the number of cores to parallelize to. Defaults to all available "
                  "processing units if argument is ommitted.")
+        execution_group.add_argument(
+            '--dataflow',
+            action='store_true',
+            help="Execute operations as soon as they become eligible instead of executing "
+                 "them in passes.")
+        execution_group.add_argument(
+            '--pack',
+            action='store_true',
+            help="Execute operations concurrently, such that the processors, GPUs, and memory "
+                 "requested with their np, ngpu, and memory directives do not exceed the "
+                 "available resources. The number of available processors is given by "
+                 "--parallel and defaults to all available processing units.")
+        execution_group.add_argument(
+            '--ngpu',
+            type=int,
+            help="The number of GPUs available for packed execution. GPUs are not considered "
+                 "if omitted.")
+        execution_group.add_argument(
+            '--memory',
+            type=float,
+            help="The memory in GB available for packed execution. Defaults to the physical "
+                 "memory of this machine.")
+        execution_group.add_argument(
+            '--asynchronous',
+            action='store_true',
+            help="Execute the commands of operations as asynchronous subprocesses instead of "
+                 "with a process pool. The number of concurrently executed commands is given "
+                 "by --parallel and defaults to all available processing units. Requires "
+                 "Python 3.5 or higher.")
         parser_run.set_defaults(func=self._main_run)
 
         parser_script = subparsers.add_parser(
@@ -2610,11 +4158,13 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             parents=[base_parser],
         )
         self._add_submit_args(parser_submit)
-        env_group = parser_submit.add_argument_group(
-            '{} options'.format(self._environment.__name__))
-        self._environment.add_args(env_group)
+        if subcommand == 'submit':
+            env_group = parser_submit.add_argument_group(
+                '{} options'.format(self._environment.__name__))
+            self._environment.add_args(env_group)
+            print('Using environment configuration:', self._environment.__name__,
+                  file=sys.stderr)
         parser_submit.set_defaults(func=self._main_submit)
-        print('Using environment configuration:', self._environment.__name__, file=sys.stderr)
 
         parser_exec = subparsers.add_parser(
             'exec',
@@ -2680,7 +4230,7 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             print("Error: Failed to complete execution due to "
                   "timeout ({}s).".format(args.timeout), file=sys.stderr)
             _exit_or_raise()
-        except Jinja2TemplateNotFound as error:
+        except _template_not_found_error() as error:
             print("Did not find template script '{}'.".format(error), file=sys.stderr)
             _exit_or_raise()
         except AssertionError:
@@ -2702,16 +4252,46 @@ class FlowProject(six.with_metaclass(_FlowProjectClass,
             _exit_or_raise()
 
 
-def _fork_with_serialization(loads, project, operation):
-    """Invoke the _fork() method on a serialized project instance."""
+def _template_not_found_error():
+    "Return the exception type raised for missing templates without importing jinja2 early."
+    from jinja2 import TemplateNotFound
+    return TemplateNotFound
+
+
+# The project instance of a worker process, see _init_worker_with_serialization().
+_WORKER_PROJECT = None
+
+
+def _init_worker_with_serialization(loads, project):
+    """Unpickle the project instance once per worker process."""
+    global _WORKER_PROJECT
+    _WORKER_PROJECT = loads(project)
+
+
+def _fork_in_worker(operation):
+    """Invoke the _fork() method of the worker's project instance and return the operation."""
+    _WORKER_PROJECT._fork(_WORKER_PROJECT._loads_op(operation))
+    return operation
+
+
+def _get_job_status_with_serialization(loads, project, job_ids, ignore_errors, cached_status):
+    """Determine the status of the given jobs on a serialized project instance."""
     project = loads(project)
-    project._fork(project._loads_op(operation))
+    return list(project._get_job_status_chunk(job_ids, ignore_errors, loads(cached_status)))
 
 
 ###
 # Status-related helper functions
 
 
+def _ljust(cell, width):
+    "Left-justify cell to width, ignoring any terminal markup."
+    return cell + ' ' * (width - len(_TERMINAL_MARKUP.sub('', cell)))
+
+
+_TERMINAL_MARKUP = re.compile(r'\033\[[0-9;]*m')
+
+
 _FMT_SCHEDULER_STATUS = {
     JobStatus.unknown: 'U',
     JobStatus.registered: 'R',
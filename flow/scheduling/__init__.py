@@ -2,9 +2,8 @@
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
 """Defines the API for the scheduling system."""
-from .fakescheduler import FakeScheduler
-from .torque import TorqueScheduler
-from .slurm import SlurmScheduler
+import sys
+import importlib
 
 
 __all__ = [
@@ -12,3 +11,23 @@ __all__ = [
     'TorqueScheduler',
     'SlurmScheduler',
     ]
+
+_MODULES = {
+    'FakeScheduler': '.fakescheduler',
+    'TorqueScheduler': '.torque',
+    'SlurmScheduler': '.slurm',
+    }
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        # The scheduler drivers are only imported on first access.
+        try:
+            module = importlib.import_module(_MODULES[name], __name__)
+        except KeyError:
+            raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+        return getattr(module, name)
+else:
+    from .fakescheduler import FakeScheduler  # noqa: F401
+    from .torque import TorqueScheduler  # noqa: F401
+    from .slurm import SlurmScheduler  # noqa: F401
@@ -50,6 +50,16 @@ class Scheduler(object):
     # assume that repeated scheduler queries might risk a denial-of-service attack.
     _dos_timeout = 10
 
+    # The name of the environment variable that holds the task id of a job array
+    # task within the execution script; None if job arrays are not supported.
+    array_task_id_var = None
+
+    # The task id of the first task of a job array.
+    array_task_id_offset = 0
+
+    # The maximum number of tasks per job array; None if there is no limit.
+    array_max_size = None
+
     @classmethod
     def _prevent_dos(cls):
         """This method should be called before querying the scheduler.
@@ -72,3 +82,21 @@ class Scheduler(object):
             :class:`.ClusterJob`
         """
         raise NotImplementedError()
+
+    def jobs_with_prefix(self, prefix):
+        """Yield all cluster jobs whose name starts with prefix.
+
+        The default implementation filters the cluster jobs yielded by :meth:`~.jobs`.
+        Schedulers that are able to filter cluster jobs by name should override this
+        method to reduce the amount of information that is queried and parsed.
+
+        :param prefix:
+            The name prefix of the cluster jobs to yield.
+        :type prefix:
+            str
+        :yields:
+            :class:`.ClusterJob`
+        """
+        for job in self.jobs():
+            if job.name().startswith(prefix):
+                yield job
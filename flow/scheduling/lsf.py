@@ -34,13 +34,19 @@ def _parse_status(s):
     return JobStatus.registered
 
 
-def _fetch(user=None):
-    "Fetch the cluster job status information from the LSF scheduler."
+def _fetch(user=None, prefix=None):
+    """Fetch the cluster job status information from the LSF scheduler.
+
+    If a prefix is provided, the scheduler only reports cluster jobs whose
+    name starts with prefix.
+    """
 
     if user is None:
         user = getpass.getuser()
 
     cmd = ['bjobs', '-json', '-u', user]
+    if prefix is not None:
+        cmd.extend(['-J', prefix + '*'])
     try:
         result = json.loads(subprocess.check_output(cmd).decode('utf-8'))
     except subprocess.CalledProcessError:
@@ -54,6 +60,8 @@ def _fetch(user=None):
         raise RuntimeError("Could not parse LSF JSON output.")
 
     for record in result['RECORDS']:
+        if 'ERROR' in record:   # e.g., no job matches the name
+            continue
         yield LSFJob(record)
 
 
@@ -83,6 +91,14 @@ class LSFScheduler(Scheduler):
     # The standard command used to submit jobs to the LSF scheduler.
     submit_cmd = ['bsub']
 
+    # Job array elements are identified by the LSB_JOBINDEX variable; the
+    # elements are reported with the name '<name>[<index>]'.
+    array_task_id_var = 'LSB_JOBINDEX'
+    array_task_id_offset = 1
+
+    # The default value of the MAX_JOB_ARRAY_SIZE configuration parameter.
+    array_max_size = 1000
+
     def __init__(self, user=None, **kwargs):
         super(LSFScheduler, self).__init__(**kwargs)
         self.user = user
@@ -93,6 +109,12 @@ class LSFScheduler(Scheduler):
         for job in _fetch(user=self.user):
             yield job
 
+    def jobs_with_prefix(self, prefix):
+        "Yield cluster jobs whose name starts with prefix by querying the scheduler."
+        self._prevent_dos()
+        for job in _fetch(user=self.user, prefix=prefix):
+            yield job
+
     def submit(self, script, after=None, hold=False, pretend=False, flags=None, **kwargs):
         """Submit a job script for execution to the scheduler.
 
@@ -20,8 +20,21 @@ from ..errors import SubmitError
 logger = logging.getLogger(__name__)
 
 
-def _fetch(user=None):
-    "Fetch the cluster job status information from the SLURM scheduler."
+def _array_task_ids(tasks):
+    "Yield all task ids of an array task specification, e.g., '0-3,7%2'."
+    for part in tasks.split('%')[0].split(','):
+        first, _, last = part.partition('-')
+        for task_id in range(int(first), int(last or first) + 1):
+            yield task_id
+
+
+def _fetch(user=None, prefix=None):
+    """Fetch the cluster job status information from the SLURM scheduler.
+
+    The output of the query is parsed line by line and only cluster jobs
+    whose name starts with prefix are yielded if a prefix is provided.
+    Job array tasks are yielded individually with the name '<name>[<task id>]'.
+    """
 
     def parse_status(s):
         s = s.strip()
@@ -38,22 +51,33 @@ def _fetch(user=None):
     if user is None:
         user = getpass.getuser()
 
-    cmd = ['squeue', '-u', user, '-h', "--format=%2t%100j"]
+    cmd = ['squeue', '-u', user, '-h', "--format=%t|%K|%j"]
     try:
-        result = subprocess.check_output(cmd).decode('utf-8', errors='backslashreplace')
-    except subprocess.CalledProcessError:
-        raise
-    except IOError as error:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    except (IOError, OSError) as error:
         if error.errno != errno.ENOENT:
             raise
         else:
             raise RuntimeError("SLURM not available.")
-    lines = result.split('\n')
-    for line in lines:
-        if line:
-            status = line[:2]
-            name = line[2:].rstrip()
-            yield SlurmJob(name, parse_status(status))
+    try:
+        for line in proc.stdout:
+            line = line.decode('utf-8', errors='backslashreplace').rstrip('\n')
+            if line:
+                status, tasks, name = line.split('|', 2)
+                if prefix is None or name.startswith(prefix):
+                    status = parse_status(status)
+                    try:
+                        task_ids = list(_array_task_ids(tasks))
+                    except ValueError:  # not a job array, i.e., 'N/A'
+                        yield SlurmJob(name, status)
+                    else:
+                        for task_id in task_ids:
+                            yield SlurmJob('{}[{}]'.format(name, task_id), status)
+    finally:
+        proc.stdout.close()
+        returncode = proc.wait()
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd)
 
 
 class SlurmJob(ClusterJob):
@@ -75,6 +99,12 @@ class SlurmScheduler(Scheduler):
     # The standard command used to submit jobs to the SLURM scheduler.
     submit_cmd = ['sbatch']
 
+    # Job array tasks are identified by the SLURM_ARRAY_TASK_ID variable.
+    array_task_id_var = 'SLURM_ARRAY_TASK_ID'
+
+    # The default value of the MaxArraySize configuration parameter minus one.
+    array_max_size = 1000
+
     def __init__(self, user=None, **kwargs):
         super(SlurmScheduler, self).__init__(**kwargs)
         self.user = user
@@ -85,6 +115,12 @@ class SlurmScheduler(Scheduler):
         for job in _fetch(user=self.user):
             yield job
 
+    def jobs_with_prefix(self, prefix):
+        "Yield cluster jobs whose name starts with prefix by querying the scheduler."
+        self._prevent_dos()
+        for job in _fetch(user=self.user, prefix=prefix):
+            yield job
+
     def submit(self, script, after=None, hold=False, pretend=False, flags=None, **kwargs):
         """Submit a job script for execution to the scheduler.
 
@@ -1,9 +1,16 @@
 # Copyright (c) 2018 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
+import os
+import json
+import time
+import uuid
 import logging
 
+from .base import ClusterJob
 from .base import JobStatus
+from ..util.store import ShardedJSONStore
+from ..util.store import _replace
 
 logger = logging.getLogger(__name__)
 
@@ -41,3 +48,231 @@ def update_status(job, scheduler_jobs=None):
             status_doc[scheduler_job_id] = int(status)
     # Write back to job document
     job.document['status'] = status_doc
+
+
+class ProjectDocumentStatusStore(object):
+    """Store the scheduler status of job-operations within the project document.
+
+    All status information is stored as one dictionary under the `_status` key
+    of the project document. This store is not recommended for large data
+    spaces, because the complete document is read and written for each access.
+
+    :param project:
+        The project whose document is used to store the status information.
+    """
+
+    def __init__(self, project):
+        self._project = project
+
+    def get(self, job_op_id, default=None):
+        "Return the status of the job-operation with the given id."
+        try:
+            return self._project.document['_status'].get(job_op_id, default)
+        except KeyError:
+            return default
+
+    def snapshot(self):
+        "Return a mapping of job-operation ids to their status for bulk reads."
+        try:
+            return self._project.document['_status']._as_dict()
+        except KeyError:
+            return dict()
+
+    def update(self, statuses):
+        "Update the status of all job-operations in the statuses mapping."
+        if statuses:
+            try:
+                self._project.document['_status'].update(statuses)
+            except KeyError:
+                self._project.document['_status'] = dict(statuses)
+
+    def clear(self):
+        "Remove all status information."
+        self._project.document.pop('_status', None)
+
+
+class ShardedStatusStore(object):
+    """Store the scheduler status of job-operations in a sharded store on disk.
+
+    The status information is distributed across multiple files based on the
+    job-operation id, such that only the files containing modified entries
+    need to be rewritten. Each operation of this store reads the current
+    state from disk to account for modifications by other processes, with the
+    exception of snapshots, which only read each file once.
+
+    :param root:
+        The directory in which the status information is stored.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def _open(self):
+        return _StatusShards(self.root)
+
+    def get(self, job_op_id, default=None):
+        "Return the status of the job-operation with the given id."
+        return self._open().get(job_op_id, default)
+
+    def snapshot(self):
+        "Return a mapping of job-operation ids to their status for bulk reads."
+        return self._open()
+
+    def update(self, statuses):
+        "Update the status of all job-operations in the statuses mapping."
+        if statuses:
+            shards = self._open()
+            shards.update(statuses)
+            shards.flush()
+
+    def clear(self):
+        "Remove all status information."
+        self._open().clear()
+
+    def migrate(self, legacy_store):
+        """Move all entries from the legacy store into this store.
+
+        Entries that already exist in this store are not overwritten.
+
+        :param legacy_store:
+            The store to migrate from, e.g., an instance of
+            :class:`~.ProjectDocumentStatusStore`.
+        """
+        legacy = legacy_store.snapshot()
+        if legacy:
+            logger.info("Migrating {} status entries.".format(len(legacy)))
+            shards = self._open()
+            shards.update({job_op_id: status for job_op_id, status in legacy.items()
+                           if job_op_id not in shards})
+            shards.flush()
+            legacy_store.clear()
+
+
+class _StatusShards(ShardedJSONStore):
+    "Distribute entries based on the last characters of the job-operation id, which is a hash."
+
+    def _shard_id(self, key):
+        return key[-self._prefix_length:]
+
+
+class SchedulerSnapshot(object):
+    """Share the result of one scheduler query across all queries within a time window.
+
+    Schedulers are protected against repeated queries within a short period of
+    time, see :meth:`~.Scheduler._prevent_dos`. The snapshot stores the cluster
+    jobs returned by the last query and returns them for all subsequent queries
+    of the same scheduler type within ttl seconds. Jobs submitted within that
+    window are added to the snapshot, see :meth:`~.add`.
+
+    The snapshot always contains all cluster jobs of the scheduler, such that it
+    is valid for queries with and without a name prefix; the cluster jobs are then
+    filtered by their name within this process. Only if the snapshot is disabled,
+    queries with a name prefix are forwarded to :meth:`~.Scheduler.jobs_with_prefix`.
+
+    :param ttl:
+        The time in seconds for which a snapshot is valid; a value of zero
+        disables the snapshot, such that each query is forwarded to the scheduler.
+    :type ttl:
+        float
+    :param fn:
+        An optional file name used to share the snapshot across processes.
+    :type fn:
+        str
+    """
+
+    def __init__(self, ttl, fn=None):
+        self.ttl = ttl
+        self.fn = fn
+        self._snapshot = None
+
+    @staticmethod
+    def _key(scheduler):
+        return '{}.{}'.format(type(scheduler).__module__, type(scheduler).__name__)
+
+    def _is_valid(self, snapshot, key):
+        return snapshot is not None and snapshot['scheduler'] == key and \
+            0 <= time.time() - snapshot['time'] < self.ttl
+
+    def _current(self, key):
+        "Return the snapshot for the given scheduler key if it is still valid, otherwise None."
+        if self._is_valid(self._snapshot, key):
+            return self._snapshot
+        if self.fn is not None:
+            try:
+                with open(self.fn) as file:
+                    snapshot = json.load(file)
+            except (IOError, OSError, ValueError):
+                pass
+            else:
+                if self._is_valid(snapshot, key):
+                    self._snapshot = snapshot
+                    return snapshot
+
+    def _save(self):
+        if self.fn is not None:
+            fn_tmp = '{}._{}'.format(self.fn, uuid.uuid4())
+            with open(fn_tmp, 'w') as file:
+                json.dump(self._snapshot, file)
+            _replace(fn_tmp, self.fn)
+
+    def jobs(self, scheduler, prefix=None):
+        """Return the cluster jobs of scheduler, either from a valid snapshot or by query.
+
+        :param scheduler:
+            The scheduler instance.
+        :type scheduler:
+            :class:`~.Scheduler`
+        :param prefix:
+            Only return cluster jobs whose name starts with prefix.
+        :type prefix:
+            str
+        :returns:
+            A list of :class:`~.ClusterJob` instances.
+        """
+        if self.ttl <= 0:
+            if prefix is None:
+                return list(scheduler.jobs())
+            else:
+                return list(scheduler.jobs_with_prefix(prefix))
+        key = self._key(scheduler)
+        snapshot = self._current(key)
+        if snapshot is None:
+            snapshot = self._snapshot = {
+                'scheduler': key,
+                'time': time.time(),
+                'jobs': [[cjob.name(), None if cjob.status() is None else int(cjob.status())]
+                         for cjob in scheduler.jobs()],
+            }
+            self._save()
+        else:
+            logger.debug("Using scheduler snapshot from {:.1f} seconds ago.".format(
+                time.time() - snapshot['time']))
+        return [ClusterJob(name, None if status is None else JobStatus(status))
+                for name, status in snapshot['jobs']
+                if prefix is None or name.startswith(prefix)]
+
+    def add(self, name, status):
+        """Add a newly submitted cluster job to the current snapshot, if there is one.
+
+        :param name:
+            The name of the cluster job.
+        :type name:
+            str
+        :param status:
+            The status of the cluster job after submission.
+        :type status:
+            :class:`~.JobStatus`
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and self._is_valid(snapshot, snapshot['scheduler']):
+            snapshot['jobs'].append([name, int(status)])
+            self._save()
+
+    def clear(self):
+        "Invalidate the snapshot."
+        self._snapshot = None
+        if self.fn is not None:
+            try:
+                os.remove(self.fn)
+            except (IOError, OSError):
+                pass
@@ -6,13 +6,12 @@
 This module implements the Scheduler and ClusterJob classes for TORQUE.
 """
 from __future__ import print_function
-import io
+import re
 import errno
 import getpass
 import subprocess
 import tempfile
 import logging
-import xml.etree.ElementTree as ET
 
 from .base import Scheduler
 from .base import ClusterJob, JobStatus
@@ -21,58 +20,90 @@ from .base import ClusterJob, JobStatus
 logger = logging.getLogger(__name__)
 
 
-def _fetch(user=None):
-    "Fetch the cluster job status information from the TORQUE scheduler."
+_ARRAY_TASK_ID = re.compile(r'\[(\d*)\]')
+
+
+def _parse_status(job_state):
+    if job_state == 'R':
+        return JobStatus.active
+    if job_state == 'Q':
+        return JobStatus.queued
+    if job_state == 'C':
+        return JobStatus.inactive
+    if job_state == 'H':
+        return JobStatus.held
+    return JobStatus.registered
+
+
+def _fetch(user=None, prefix=None):
+    """Fetch the cluster job status information from the TORQUE scheduler.
+
+    The XML output of the query is parsed incrementally and each job element
+    is discarded as soon as the corresponding cluster job has been yielded,
+    such that the memory usage does not depend on the number of cluster jobs.
+    If a prefix is provided, only cluster jobs whose name starts with prefix
+    are yielded. Job array tasks are yielded individually with the name
+    '<name>[<task id>]'.
+    """
+    import xml.etree.ElementTree as ET
+
     if user is None:
         user = getpass.getuser()
-    cmd = "qstat -fx -u {user}".format(user=user)
+    cmd = "qstat -fx -t -u {user}".format(user=user)
+    try:
+        proc = subprocess.Popen(cmd.split(), stdout=subprocess.PIPE)
+    except (IOError, OSError) as error:
+        if error.errno == errno.ENOENT:
+            raise RuntimeError("Torque not available.")
+        else:
+            raise error
     try:
-        result = io.BytesIO(subprocess.check_output(cmd.split()))
-        tree = ET.parse(source=result)
-        return tree.getroot()
+        root = None
+        for event, elem in ET.iterparse(proc.stdout, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = elem
+            elif elem.tag == 'Job':
+                job_id = elem.findtext('Job_Id')
+                name = elem.findtext('Job_Name')
+                task_id = _ARRAY_TASK_ID.search(job_id or '')
+                if task_id is not None:
+                    task_id = task_id.group(1)
+                    if not task_id:     # summary of the job array, tasks are listed below
+                        root.clear()
+                        continue
+                    if name is not None:
+                        # The tasks of a job array are named '<name>-<task id>'.
+                        if name.endswith('-' + task_id):
+                            name = name[:-len(task_id) - 1]
+                        name = '{}[{}]'.format(name, task_id)
+                if prefix is None or (name is not None and name.startswith(prefix)):
+                    yield TorqueJob(job_id, name, _parse_status(elem.findtext('job_state')))
+                root.clear()    # Discard all job elements parsed so far.
     except ET.ParseError as error:
         if str(error) == 'no element found: line 1, column 0':
             logger.warn(
                 "No scheduler jobs, from any user(s), were detected. "
                 "This may be the result of a misconfiguration in the "
                 "environment.")
-            # Return empty, but well-formed result:
-            return ET.parse(source=io.BytesIO(b"<Data></Data>"))
         else:
             raise
-    except (IOError, OSError) as error:
-        if error.errno == errno.ENOENT:
-            raise RuntimeError("Torque not available.")
-        else:
-            raise error
+    finally:
+        proc.stdout.close()
+        returncode = proc.wait()
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd.split())
 
 
 class TorqueJob(ClusterJob):
     "Implementation of the abstract ClusterJob class for TORQUE schedulers."
 
-    def __init__(self, node):
-        self.node = node
-
-    def _id(self):
-        return self.node.find('Job_Id').text
-
-    def __str__(self):
-        return str(self._id())
+    def __init__(self, jobid, name, status):
+        super(TorqueJob, self).__init__(jobid, status)
+        self._name = name
 
     def name(self):
-        return self.node.find('Job_Name').text
-
-    def status(self):
-        job_state = self.node.find('job_state').text
-        if job_state == 'R':
-            return JobStatus.active
-        if job_state == 'Q':
-            return JobStatus.queued
-        if job_state == 'C':
-            return JobStatus.inactive
-        if job_state == 'H':
-            return JobStatus.held
-        return JobStatus.registered
+        return self._name
 
 
 class TorqueScheduler(Scheduler):
@@ -89,6 +120,9 @@ class TorqueScheduler(Scheduler):
     # The standard command used to submit jobs to the TORQUE scheduler.
     submit_cmd = ['qsub']
 
+    # Job array tasks are identified by the PBS_ARRAYID variable.
+    array_task_id_var = 'PBS_ARRAYID'
+
     def __init__(self, user=None, **kwargs):
         super(TorqueScheduler, self).__init__(**kwargs)
         self.user = user
@@ -96,9 +130,14 @@ class TorqueScheduler(Scheduler):
     def jobs(self):
         "Yield cluster jobs by querying the scheduler."
         self._prevent_dos()
-        nodes = _fetch(user=self.user)
-        for node in nodes.findall('Job'):
-            yield TorqueJob(node)
+        for job in _fetch(user=self.user):
+            yield job
+
+    def jobs_with_prefix(self, prefix):
+        "Yield cluster jobs whose name starts with prefix by querying the scheduler."
+        self._prevent_dos()
+        for job in _fetch(user=self.user, prefix=prefix):
+            yield job
 
     def submit(self, script, after=None, pretend=False, hold=False, flags=None, *args, **kwargs):
         """Submit a job script for execution to the scheduler.
@@ -15,17 +15,30 @@ cd {{ project.config.project_dir }}
 {% endblock %}
 {% block body %}
 {% set cmd_suffix = cmd_suffix|default('') ~ (' &' if parallel else '') %}
+{% if array %}
+
+case ${{ array.task_id_var }} in
+{% endif %}
 {% for operation in operations %}
 {% if operation.directives.nranks and not mpi_prefix %}
 {% set mpi_prefix = "%s -n %d "|format(mpiexec|default("mpiexec"), operation.directives.nranks) %}
 {% endif %}
+{% if array %}
+{{ array.task_id_offset + loop.index0 }})
+{% endif %}
 
 # {{ "%s"|format(operation) }}
 {% if operation.directives.omp_num_threads %}
 export OMP_NUM_THREADS={{ operation.directives.omp_num_threads }}
 {% endif %}
 {{ mpi_prefix }}{{ cmd_prefix }}{{ operation.cmd }}{{ cmd_suffix }}
+{% if array %}
+;;
+{% endif %}
 {% endfor %}
+{% if array %}
+esac
+{% endif %}
 {% endblock %}
 {% block footer %}
 {% if parallel %}
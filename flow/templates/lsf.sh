@@ -1,7 +1,11 @@
 {% extends "base_script.sh" %}
 {% block header %}
 #!/bin/bash
+{% if array %}
+#BSUB -J "{{ id }}[{{ array.task_id_offset }}-{{ array.task_id_offset + array.num_tasks - 1 }}]"
+{% else %}
 #BSUB -J {{ id }}
+{% endif %}
 {% if partition %}
 #BSUB -q {{ partition }}
 {% endif %}
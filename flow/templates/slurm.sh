@@ -2,6 +2,9 @@
 {% block header %}
 #!/bin/bash
 #SBATCH --job-name="{{ id }}"
+{% if array %}
+#SBATCH --array={{ array.task_id_offset }}-{{ array.task_id_offset + array.num_tasks - 1 }}
+{% endif %}
 {% if partition %}
 #SBATCH --partition={{ partition }}
 {% endif %}
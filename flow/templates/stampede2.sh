@@ -36,6 +36,9 @@
 {% endblock %}
 
 {% block body %}
+{% if array %}
+{% raise "Job arrays are not supported by Stampede2!" %}
+{% endif %}
 {% if ns.use_launcher %}
 {% if parallel %}
 {{("Bundled submission without MPI on Stampede2 is using launcher; the --parallel option is therefore ignored.")|print_warning}}
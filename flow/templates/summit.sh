@@ -16,6 +16,9 @@
 {% endif %}
 {% endblock %}
 {% block body %}
+{% if array %}
+{% raise "Job arrays are not supported by Summit!" %}
+{% endif %}
 {% set cmd_suffix = cmd_suffix|default('') ~ (' &' if parallel else '') %}
 {% for operation in operations %}
 {% set extra_args = operation|jsrun_extra_args %}
@@ -1,6 +1,9 @@
 {% extends "base_script.sh" %}
 {% block header %}
 #PBS -N {{ id }}
+{% if array %}
+#PBS -t {{ array.task_id_offset }}-{{ array.task_id_offset + array.num_tasks - 1 }}
+{% endif %}
 {% if walltime %}
 #PBS -l walltime={{ walltime|format_timedelta }}
 {% endif %}
@@ -2,6 +2,9 @@
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
 "Defines the API for the util sub package."
-from . import tabulate, tqdm, misc, translate, template_filters
+from . import misc, translate, template_filters
+
+# The tabulate and tqdm modules are only imported where needed to reduce
+# the import time of the flow package.
 
 __all__ = ['tabulate', 'tqdm', 'misc', 'translate', 'template_filters']
@@ -0,0 +1,120 @@
+# Copyright (c) 2019 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Execute shell commands concurrently as asynchronous subprocesses.
+
+All commands are executed from one event loop, such that the number of
+concurrently executed commands is not limited by the number of processes
+of a process pool. The output of the commands is forwarded line by line.
+
+This module requires Python 3.5 or higher and must only be imported when needed.
+"""
+import os
+import sys
+import codecs
+import signal
+import asyncio
+from subprocess import PIPE
+from subprocess import TimeoutExpired
+
+
+async def _forward(stream, file, chunk_size=2 ** 16):
+    """Forward all lines read from stream to file.
+
+    Complete lines are forwarded at once, such that the output of concurrently
+    executed commands is not mixed within lines. Lines that are longer than the
+    stream's buffer limit are forwarded in chunks.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    while True:
+        try:
+            line = await stream.readuntil(b'\n')
+        except asyncio.IncompleteReadError as error:    # The end of the stream.
+            line = error.partial
+        except asyncio.LimitOverrunError:
+            line = await stream.read(chunk_size)
+        if not line:
+            break
+        file.write(decoder.decode(line))
+        file.flush()
+
+
+def _kill(process):
+    "Kill the process and, on POSIX systems, all processes in its process group."
+    try:
+        if hasattr(os, 'killpg'):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+async def _run_command(cmd, semaphore, timeout, stdout, stderr):
+    "Execute cmd once the semaphore is acquired and return its exit code."
+    async with semaphore:
+        # The shell is started in a new session, such that the processes started
+        # by the command can be killed together with the shell.
+        process = await asyncio.create_subprocess_shell(
+            cmd, stdout=PIPE, stderr=PIPE, start_new_session=hasattr(os, 'killpg'))
+        try:
+            await asyncio.wait_for(asyncio.gather(
+                _forward(process.stdout, stdout),
+                _forward(process.stderr, stderr),
+                process.wait()), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutExpired(cmd, timeout)
+        finally:
+            if process.returncode is None:
+                _kill(process)
+                await process.wait()
+        return process.returncode
+
+
+async def _run_commands(commands, max_concurrency, timeout, callback):
+    semaphore = asyncio.Semaphore(max_concurrency)
+    stdout, stderr = sys.stdout, sys.stderr
+    tasks = [asyncio.ensure_future(_run_command(cmd, semaphore, timeout, stdout, stderr))
+             for cmd in commands]
+    try:
+        for future in asyncio.as_completed(tasks):
+            await future
+            if callback is not None:
+                callback()
+        return [task.result() for task in tasks]
+    finally:
+        # Cancel and thereby kill all remaining commands in case of an error.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def run_commands(commands, max_concurrency, timeout=None, callback=None):
+    """Execute shell commands as asynchronous subprocesses.
+
+    The standard output and error of the commands are forwarded line by line
+    to sys.stdout and sys.stderr. If one of the commands fails to complete
+    within the timeout, all remaining commands are killed.
+
+    :param commands:
+        The shell commands to execute.
+    :param max_concurrency:
+        The maximum number of concurrently executed commands.
+    :param timeout:
+        An optional timeout for each command in seconds.
+    :param callback:
+        An optional function that is called without arguments whenever
+        a command completed.
+    :returns:
+        The exit codes of the commands in the order of commands.
+    :raises subprocess.TimeoutExpired:
+        If one of the commands did not complete within the timeout.
+    """
+    coro = _run_commands(list(commands), max_concurrency, timeout, callback)
+    if hasattr(asyncio, 'run'):
+        return asyncio.run(coro)
+    else:
+        return asyncio.get_event_loop().run_until_complete(coro)
+
+
+__all__ = ['run_commands']
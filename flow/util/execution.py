@@ -1,6 +1,8 @@
 # Copyright (c) 2018 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
+import os
+import time
 import subprocess
 from signac.common import six
 
@@ -13,15 +15,55 @@ else:
     from subprocess import TimeoutExpired
 
 
+def _wait4(process, timeout=None):
+    """Wait for the process to terminate and return its resource usage.
+
+    The process is polled until the timeout expires, like :meth:`subprocess.Popen.wait` does.
+    """
+    if timeout is None:
+        _, status, rusage = os.wait4(process.pid, 0)
+    else:
+        deadline = time.time() + timeout
+        delay = 0.0005
+        while True:
+            pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+            if pid:
+                break
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise TimeoutExpired(process.args, timeout)
+            delay = min(2 * delay, remaining, 0.05)
+            time.sleep(delay)
+    # The process was reaped, its exit status must not be waited for again.
+    process.returncode = -os.WTERMSIG(status) if os.WIFSIGNALED(status) \
+        else os.WEXITSTATUS(status)
+    return rusage
+
+
 def fork(cmd, timeout=None):
-    "Helper function for py2/3 compatible execution of forked processes."
-    if timeout is not None:
+    """Helper function for py2/3 compatible execution of forked processes.
+
+    :returns:
+        The resource usage of the forked process, including all of its children,
+        as returned by :func:`os.wait4`, or None if it is not available on this system.
+    """
+    if six.PY2 and timeout is not None:
         raise RuntimeError("Executing with a timeout is not supported in Python 2.7.")
 
-    if six.PY2:
-        subprocess.call(cmd, shell=True)
-    else:
-        subprocess.call(cmd, shell=True, timeout=timeout)
+    if not hasattr(os, 'wait4'):
+        if six.PY2:
+            subprocess.call(cmd, shell=True)
+        else:
+            subprocess.call(cmd, shell=True, timeout=timeout)
+        return None
+
+    process = subprocess.Popen(cmd, shell=True)
+    try:
+        return _wait4(process, timeout)
+    except:  # noqa: E722, like subprocess.call()
+        process.kill()
+        process.wait()
+        raise
 
 
 __all__ = ['fork', 'TimeoutExpired']
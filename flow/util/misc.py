@@ -3,14 +3,22 @@
 # This software is licensed under the BSD 3-Clause License.
 import os
 import re
+import time
 import errno
+import threading
 import json
 import argparse
 import logging
 from contextlib import contextmanager
+from collections import defaultdict
 
 from signac.common import six
 
+try:
+    import fcntl
+except ImportError:     # The fcntl module is not available on Windows.
+    fcntl = None
+
 
 def _mkdir_p(path):
     """"Create a directory at 'path', ignore if the directory already exists.
@@ -45,6 +53,34 @@ def _positive_int(value):
     return ivalue
 
 
+def _physical_memory():
+    "Return the total physical memory of this machine in GB or None if unknown."
+    try:
+        return float(os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')) / 1024 ** 3
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+@contextmanager
+def _lock_file(filename):
+    """Hold an exclusive lock on the given lock file within this context.
+
+    The lock excludes other processes, including those on other hosts if the
+    network file system supports POSIX locks, but not other threads of the same
+    process. No lock is acquired on systems without the fcntl module.
+    """
+    if fcntl is None:
+        yield
+        return
+    _mkdir_p(os.path.dirname(filename))
+    with open(filename, 'a') as file:
+        fcntl.lockf(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.lockf(file, fcntl.LOCK_UN)
+
+
 def draw_progressbar(value, total, width=40):
     """Visualize progess with a progress bar.
 
@@ -158,6 +194,40 @@ def switch_to_directory(root=None):
             os.chdir(cwd)
 
 
+def _flatten_dict(mapping, prefix=''):
+    "Yield all (key, value) pairs of a nested mapping, nested keys are joined with '.'."
+    for key, value in mapping.items():
+        if isinstance(value, dict) and value:
+            for item in _flatten_dict(value, prefix + str(key) + '.'):
+                yield item
+        else:
+            yield prefix + str(key), value
+
+
+def _varying_keys(mappings):
+    """Return the sorted list of (nested) keys whose values vary across mappings.
+
+    A key is considered to vary if any two values differ or if the key is missing
+    in at least one of the mappings. Nested keys are joined with '.' and values are
+    compared by their JSON representation, such that unhashable values (e.g. lists)
+    are supported. The mappings are iterated over exactly once.
+    """
+    first = dict()
+    counts = defaultdict(int)
+    varying = set()
+    num_mappings = 0
+    for mapping in mappings:
+        num_mappings += 1
+        for key, value in _flatten_dict(mapping):
+            counts[key] += 1
+            if key not in varying:
+                value = json.dumps(value, sort_keys=True)
+                if first.setdefault(key, value) != value:
+                    varying.add(key)
+    varying.update(key for key, num in counts.items() if num < num_mappings)
+    return list(sorted(varying))
+
+
 def _is_identifier(name):
     """Check if 'name' is a valid Python identifier.
 
@@ -195,6 +265,59 @@ class TrackGetItemDict(dict):
         return self._keys_used.copy()
 
 
+class _RateLimiter(object):
+    "Limit the rate at which calls to wait() return across all threads to rate per second."
+
+    def __init__(self, rate):
+        if rate <= 0:
+            raise ValueError("The rate must be positive.")
+        self._interval = 1.0 / rate
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        "Block until the next call is allowed."
+        with self._lock:
+            now = time.time()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class _ThreadLocalStream(object):
+    """Forward writes to the buffer set for the current thread, if any, otherwise to stream.
+
+    The buffer of a thread is set with :meth:`~.capture`.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    def _target(self):
+        buffer = getattr(self._local, 'buffer', None)
+        return self._stream if buffer is None else buffer
+
+    def write(self, data):
+        return self._target().write(data)
+
+    def flush(self):
+        return self._target().flush()
+
+    @contextmanager
+    def capture(self, buffer):
+        "Forward all writes of the current thread to buffer within this context."
+        self._local.buffer = buffer
+        try:
+            yield
+        finally:
+            self._local.buffer = None
+
+
 # Remove this after we drop Python 2.7 support:
 def fullmatch(regex, string, flags=0):
     """Emulate python-3.4 re.fullmatch()."""
@@ -0,0 +1,161 @@
+# Copyright (c) 2019 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Record the resource usage of executed operations.
+
+Each completed execution of an operation for a job is recorded with its wall time,
+CPU time, and peak resident set size (RSS). The records are appended as single
+lines of JSON to a log file, such that concurrently executed operations, e.g.,
+within different processes, can record their usage without any locking.
+
+The CPU time is determined with :func:`resource.getrusage` and includes all child
+processes that were waited for, e.g., those of forked commands. Since the peak RSS
+of a process is a maximum over its lifetime, it is only attributed to an operation
+that was executed by forked processes of its own or within a process of its own;
+it is unknown otherwise.
+"""
+from __future__ import division
+import os
+import sys
+import json
+import errno
+import time
+import logging
+from collections import namedtuple
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .misc import _mkdir_p
+
+try:
+    import resource
+except ImportError:     # The resource module is not available on Windows.
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+OperationStats = namedtuple(
+    'OperationStats', ['time', 'job_id', 'name', 'walltime', 'cputime', 'maxrss'])
+"""The resource usage of one execution of an operation for a job.
+
+The wall and CPU time are given in seconds and the peak RSS in MB; the CPU time
+and peak RSS are None if they could not be determined.
+"""
+
+
+def _cputime():
+    "Return the CPU time in seconds of this process and its children or None if unknown."
+    if resource is None:
+        return None
+    usage_self = resource.getrusage(resource.RUSAGE_SELF)
+    usage_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return sum((usage_self.ru_utime, usage_self.ru_stime,
+                usage_children.ru_utime, usage_children.ru_stime))
+
+
+def _maxrss(usage):
+    "Return the peak RSS in MB of the given resource usage."
+    # The peak RSS is provided in bytes on macOS and in kilobytes otherwise.
+    return float(usage.ru_maxrss) / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+
+@contextmanager
+def record_stats(filename, name, job, own_process=False):
+    """Record the resource usage of the execution of an operation within this context.
+
+    The context yields a function, which must be called with the resource usage of
+    each process forked for the execution, as returned by :func:`os.wait4`, such that
+    the peak RSS of the operation can be determined. Nothing is recorded if the
+    execution raises an exception.
+
+    :param filename:
+        The log file to which the record is appended.
+    :type filename:
+        str
+    :param name:
+        The name of the executed operation.
+    :type name:
+        str
+    :param job:
+        The job for which the operation is executed.
+    :type job:
+        :class:`~signac.contrib.job.Job`
+    :param own_process:
+        Whether the operation is executed within a process of its own, such that
+        the peak RSS of this process is attributed to the operation.
+    :type own_process:
+        bool
+    """
+    job_id = job.get_id()   # The job's id may change during the execution.
+    usages = []
+    start = time.time()
+    cputime_start = _cputime()
+    yield usages.append
+    walltime = time.time() - start
+    cputime = _cputime()
+    if cputime is not None:
+        cputime -= cputime_start
+    usages = [usage for usage in usages if usage is not None]
+    if own_process and resource is not None:
+        usages.append(resource.getrusage(resource.RUSAGE_SELF))
+        usages.append(resource.getrusage(resource.RUSAGE_CHILDREN))
+    maxrss = max(_maxrss(usage) for usage in usages) if usages else None
+    record = OperationStats(start, job_id, name, walltime, cputime, maxrss)
+    try:
+        _mkdir_p(os.path.dirname(filename))
+        with open(filename, 'a') as file:
+            file.write(json.dumps(list(record)) + '\n')
+    except (IOError, OSError) as error:
+        logger.warning("Unable to record the stats of operation '{}' for job '{}': {}".format(
+            name, job_id, error))
+
+
+def load_stats(filename):
+    """Yield all records of the given log file as instances of :class:`~.OperationStats`.
+
+    Corrupted records, e.g., due to an interrupted write, are skipped.
+    """
+    try:
+        with open(filename) as file:
+            for line in file:
+                try:
+                    yield OperationStats(*json.loads(line))
+                except (ValueError, TypeError):
+                    logger.debug("Skipping corrupted operation stats record: '{}'.".format(line))
+    except (IOError, OSError) as error:
+        if error.errno != errno.ENOENT:
+            raise
+
+
+def summarize_stats(records):
+    """Summarize the resource usage of operations by operation name.
+
+    :param records:
+        The records to summarize, as yielded by :func:`~.load_stats`.
+    :returns:
+        A mapping of operation names, in the order of their first record, to a dict
+        with the number of executions and the mean and maximum of the wall time,
+        CPU time, and peak RSS.
+    """
+    records_by_name = OrderedDict()
+    for record in records:
+        records_by_name.setdefault(record.name, []).append(record)
+
+    def _mean(x):
+        return sum(x) / len(x) if x else None
+
+    def _max(x):
+        return max(x) if x else None
+
+    summary = OrderedDict()
+    for name, records_ in records_by_name.items():
+        summary[name] = entry = {'executions': len(records_)}
+        for key in ('walltime', 'cputime', 'maxrss'):
+            x = [getattr(r, key) for r in records_ if getattr(r, key) is not None]
+            entry[key + '_mean'] = _mean(x)
+            entry[key + '_max'] = _max(x)
+    return summary
+
+
+__all__ = ['OperationStats', 'record_stats', 'load_stats', 'summarize_stats']
@@ -0,0 +1,131 @@
+# Copyright (c) 2019 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Persistent cache for the label and operation status of jobs.
+
+The determination of a job's status requires the evaluation of all label
+functions and all operation conditions, which may be expensive for large
+data spaces. The status cache stores the results of these evaluations
+for each job together with a fingerprint of the job's workspace, such that
+only jobs that were modified since the last status update need to be
+evaluated again.
+"""
+import os
+import time
+
+from .store import ShardedJSONStore
+
+
+# Entries whose workspace has been modified within this many seconds of
+# the status determination are not cached, since subsequent modifications
+# may go unnoticed due to the limited resolution of file modification times.
+RACY_WINDOW = 2.0
+
+
+def job_fingerprint(job):
+    """Return a fingerprint of the job's workspace.
+
+    The fingerprint is based on the modification times and sizes of all files
+    and directories located directly within the job's workspace, including the
+    state point and job document files. Modifications of files that are
+    located within sub-directories of the workspace are only detected when
+    files are added to or removed from the top-level sub-directory.
+
+    :param job:
+        The signac job handle.
+    :type job:
+        :class:`~signac.contrib.job.Job`
+    :return:
+        The fingerprint or None if the job's workspace does not exist.
+    :rtype:
+        list
+    """
+    ws = job.workspace()
+    try:
+        stats = [os.stat(ws)]
+        stats.extend(os.stat(os.path.join(ws, fn)) for fn in os.listdir(ws))
+    except (IOError, OSError):
+        return None
+    return [
+        len(stats),
+        stats[0].st_mtime,
+        max(st.st_mtime for st in stats),
+        sum(st.st_size for st in stats[1:]),
+    ]
+
+
+class JobStatusCache(object):
+    """Cache the label and operation status of jobs across status updates.
+
+    Each entry is only valid as long as the job's fingerprint, see
+    :func:`~.job_fingerprint`, and the workflow definition, as identified
+    by the definition key, remain unchanged.
+
+    :param root:
+        The directory in which the cache is stored.
+    :type root:
+        str
+    :param definition:
+        A key that identifies the definition of all labels and operations.
+    :type definition:
+        str
+    """
+
+    def __init__(self, root, definition):
+        self.definition = definition
+        self._store = ShardedJSONStore(root)
+
+    def get(self, job, fingerprint):
+        """Return the cached status of job or None if there is no valid entry.
+
+        :param job:
+            The signac job handle.
+        :param fingerprint:
+            The current fingerprint of the job.
+        """
+        if fingerprint is None:
+            return None
+        entry = self._store.get(job.get_id())
+        if entry is None:
+            return None
+        if entry['definition'] != self.definition or entry['fingerprint'] != fingerprint:
+            return None
+        return entry
+
+    def set(self, job, fingerprint, status):
+        """Store the status of job.
+
+        Only the labels and the eligibility and completion of the job's
+        operations are stored. The status is not stored if the job's
+        workspace was modified very recently.
+
+        :param job:
+            The signac job handle.
+        :param fingerprint:
+            The fingerprint of the job at the time the status was determined.
+        :param status:
+            The job status as returned by :meth:`~.FlowProject.get_job_status`.
+        """
+        if fingerprint is None or time.time() - fingerprint[2] < RACY_WINDOW:
+            return
+        entry = {
+            'definition': self.definition,
+            'fingerprint': fingerprint,
+            'labels': status['labels'],
+            'operations': [
+                [name, op['eligible'], op['completed']]
+                for name, op in status['operations'].items()],
+        }
+        if self._store.get(job.get_id()) != entry:
+            self._store[job.get_id()] = entry
+
+    def flush(self):
+        "Write all modified entries to disk."
+        self._store.flush()
+
+    def clear(self):
+        "Remove all cached entries."
+        self._store.clear()
+
+
+__all__ = ['job_fingerprint', 'JobStatusCache']
@@ -0,0 +1,146 @@
+# Copyright (c) 2019 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Simple persistent key-value stores for flow related meta data.
+
+The stores defined in this module are used to persist information, such as
+cached status information, within the project root directory in a way that
+scales with the number of entries that are actually read or modified.
+"""
+import os
+import json
+import uuid
+import errno
+import shutil
+import threading
+
+from signac.common import six
+
+from .misc import _mkdir_p
+
+
+def _replace(src, dst):
+    "Atomically replace the file at dst with the file at src."
+    if six.PY2:
+        os.rename(src, dst)
+    else:
+        os.replace(src, dst)
+
+
+class ShardedJSONStore(object):
+    """A persistent mapping of str keys to JSON-encodable values.
+
+    The entries are distributed across multiple JSON files (shards) within the
+    root directory based on the key prefix. Shards are only loaded when one of
+    their keys is accessed and only modified shards are written back to disk
+    when :meth:`~.flush` is called. All shards are written atomically.
+
+    Access to the store is thread-safe.
+
+    :param root:
+        The directory in which the shard files are stored.
+    :type root:
+        str
+    :param prefix_length:
+        The number of key characters used to determine the shard of an entry.
+    :type prefix_length:
+        int
+    """
+
+    def __init__(self, root, prefix_length=2):
+        self.root = root
+        self._prefix_length = prefix_length
+        self._shards = dict()
+        self._dirty = set()
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        with self._lock:
+            state = dict(self.__dict__)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def _shard_id(self, key):
+        "Return the id of the shard that stores the entry with the given key."
+        return key[:self._prefix_length]
+
+    def _fn_shard(self, shard_id):
+        return os.path.join(self.root, shard_id + '.json')
+
+    def _shard(self, key):
+        "Return the (loaded) shard for the given key; lock must be held."
+        shard_id = self._shard_id(key)
+        try:
+            return self._shards[shard_id]
+        except KeyError:
+            try:
+                with open(self._fn_shard(shard_id)) as file:
+                    shard = json.load(file)
+            except (IOError, OSError) as error:
+                if error.errno != errno.ENOENT:
+                    raise
+                shard = dict()
+            except ValueError:   # The shard file is corrupted, start from scratch.
+                shard = dict()
+                self._dirty.add(shard_id)
+            self._shards[shard_id] = shard
+            return shard
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._shard(key).get(key, default)
+
+    def __getitem__(self, key):
+        with self._lock:
+            return self._shard(key)[key]
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._shard(key)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._shard(key)[key] = value
+            self._dirty.add(self._shard_id(key))
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self._shard(key)[key]
+            self._dirty.add(self._shard_id(key))
+
+    def update(self, mapping):
+        "Update the store with all entries from mapping."
+        with self._lock:
+            for key, value in mapping.items():
+                self[key] = value
+
+    def flush(self):
+        "Write all modified shards to disk."
+        with self._lock:
+            if self._dirty:
+                _mkdir_p(self.root)
+            for shard_id in sorted(self._dirty):
+                fn_shard = self._fn_shard(shard_id)
+                fn_tmp = os.path.join(self.root, '._{}_{}'.format(uuid.uuid4(), shard_id))
+                with open(fn_tmp, 'w') as file:
+                    json.dump(self._shards[shard_id], file)
+                _replace(fn_tmp, fn_shard)
+            self._dirty.clear()
+
+    def clear(self):
+        "Remove all entries from the store, including those stored on disk."
+        with self._lock:
+            self._shards.clear()
+            self._dirty.clear()
+            try:
+                shutil.rmtree(self.root)
+            except (IOError, OSError) as error:
+                if error.errno != errno.ENOENT:
+                    raise
+
+
+__all__ = ['ShardedJSONStore']
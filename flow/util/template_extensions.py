@@ -0,0 +1,25 @@
+# Copyright (c) 2018 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Provide jinja2 template environment extensions.
+
+This module imports jinja2 and is therefore only imported once a template
+environment is set up.
+"""
+import jinja2
+from jinja2.ext import Extension
+
+
+class TemplateError(Extension):
+    """Indicates errors in jinja2 templates"""
+    # ref:http://jinja.pocoo.org/docs/2.10/extensions/#jinja-extensions
+    tags = set(['raise'])
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        return jinja2.nodes.CallBlock(
+            self.call_method('err', args), [], [], []).set_lineno(lineno)
+
+    def err(self, msg, caller):
+        raise jinja2.TemplateError(msg)
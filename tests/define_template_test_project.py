@@ -47,3 +47,9 @@ def gpu_op(job):
 @flow.directives(ngpu=TestProject.ngpu, nranks=TestProject.nranks)
 def mpi_gpu_op(job):
     pass
+
+
+@TestProject.operation
+@flow.cmd
+def cmd_op(job):
+    return 'echo "{job._id}"'
@@ -1,13 +1,18 @@
 # Copyright (c) 2017 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
+import os
+import json
+import socket
 import unittest
 
 from flow import get_environment
+from flow import environment
 from flow.environment import ComputeEnvironment
 from flow.environment import TestEnvironment
 from flow.errors import ConfigKeyError
 from test_project import StringIO, redirect_stdout
+from tempdir import TemporaryDirectory
 
 
 class ProjectTest(unittest.TestCase):
@@ -32,6 +37,79 @@ class ProjectTest(unittest.TestCase):
         a = env.get_config_value('a', 42)
         self.assertEqual(a, 42)
 
+    def test_environment_cache(self):
+        num_calls = []
+
+        def getfqdn():
+            num_calls.append(None)
+            return 'host.example.com'
+
+        def detect():
+            environment._FQDN = None
+            del num_calls[:]
+            return get_environment()
+
+        with TemporaryDirectory(prefix='signac-flow_') as tmp_dir:
+            fn_cache = os.path.join(tmp_dir, 'environment.json')
+            cache, environment.ENVIRONMENT_CACHE = environment.ENVIRONMENT_CACHE, fn_cache
+            socket_getfqdn, socket.getfqdn = socket.getfqdn, getfqdn
+            fqdn = environment._FQDN
+            try:
+                # Environments that are not detected by their hostname are not cached.
+                env = detect()
+                self.assertFalse(os.path.exists(fn_cache))
+
+                TestEnvironment.hostname_pattern = r'.*\.example\.com$'
+                self.assertIs(detect(), TestEnvironment)
+                self.assertEqual(len(num_calls), 1)
+                with open(fn_cache) as file:
+                    entry = json.load(file)[socket.gethostname()]
+                self.assertEqual(entry['environment'], TestEnvironment.__name__)
+
+                # The cached environment is selected without detection.
+                self.assertIs(detect(), TestEnvironment)
+                self.assertEqual(len(num_calls), 0)
+
+                # The cache is invalidated when the registered environments change.
+                entry['registry'] = entry['registry'][:-1]
+                with open(fn_cache, 'w') as file:
+                    json.dump({socket.gethostname(): entry}, file)
+                self.assertIs(detect(), TestEnvironment)
+                self.assertEqual(len(num_calls), 1)
+
+                # A cached environment is ignored once it is no longer detected by hostname.
+                del TestEnvironment.hostname_pattern
+                self.assertIs(detect(), env)
+            finally:
+                if 'hostname_pattern' in vars(TestEnvironment):
+                    del TestEnvironment.hostname_pattern
+                socket.getfqdn = socket_getfqdn
+                environment._FQDN = fqdn
+                environment.ENVIRONMENT_CACHE = cache
+
+    def test_environment_detection_by_hostname(self):
+        num_calls = []
+
+        def getfqdn():
+            num_calls.append(None)
+            return 'host.example.com'
+
+        cache, environment.ENVIRONMENT_CACHE = environment.ENVIRONMENT_CACHE, None
+        socket_getfqdn, socket.getfqdn = socket.getfqdn, getfqdn
+        fqdn, environment._FQDN = environment._FQDN, None
+        TestEnvironment.hostname_pattern = r'.*\.example\.com$'
+        try:
+            # The matching hostname takes precedence over environments registered
+            # later, which are otherwise present.
+            self.assertIs(get_environment(), TestEnvironment)
+            self.assertIs(get_environment(), TestEnvironment)
+            self.assertEqual(len(num_calls), 1)
+        finally:
+            del TestEnvironment.hostname_pattern
+            socket.getfqdn = socket_getfqdn
+            environment._FQDN = fqdn
+            environment.ENVIRONMENT_CACHE = cache
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,6 +2,7 @@
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
 from __future__ import print_function
+import atexit
 import unittest
 import logging
 import io
@@ -11,20 +12,29 @@ import sys
 import inspect
 import subprocess
 import tempfile
+import shutil
+import time
 from contextlib import contextmanager
+from collections import OrderedDict
 from distutils.version import StrictVersion
 
 import signac
 from signac.common import six
 import flow
-from flow import FlowProject, cmd, with_job, directives
+from flow import FlowProject, JobOperation, cmd, with_job, directives
+from flow.project import make_packed_bundles
+from flow.errors import SubmitError
 from flow.scheduling.base import Scheduler
 from flow.scheduling.base import ClusterJob
 from flow.scheduling.base import JobStatus
+from flow import environment
 from flow.environment import ComputeEnvironment
 from flow.util.misc import add_path_to_environment_pythonpath
 from flow.util.misc import add_cwd_to_environment_pythonpath
 from flow.util.misc import switch_to_directory
+from flow.util.misc import _varying_keys
+from flow.util import status_cache
+from flow.util.stats import load_stats
 from flow import init
 
 from define_test_project import TestProject
@@ -36,6 +46,14 @@ else:
     from tempfile import TemporaryDirectory
 
 
+# Isolate the tests, including the project modules executed in subprocesses,
+# from the environment cache of the user.
+_CACHE_HOME = tempfile.mkdtemp(prefix='signac-flow-cache_')
+atexit.register(shutil.rmtree, _CACHE_HOME, True)
+os.environ['XDG_CACHE_HOME'] = _CACHE_HOME
+environment.ENVIRONMENT_CACHE = os.path.join(_CACHE_HOME, 'signac-flow', 'environment.json')
+
+
 # Need to implement context managers below while supporting
 # Python versions 2.7 and 3.4. These managers are both part
 # of the the standard library as of Python version 3.5.
@@ -439,6 +457,21 @@ class ProjectTest(BaseProjectTest):
                     self.assertEqual(op.name, 'op2')
             self.assertEqual(i, int(job in even_jobs))
 
+    def test_job_operation_id(self):
+        project = self.mock_project()
+        job = next(iter(project))
+        op = next(project.next_operations(job))
+        op_copy = JobOperation(op.name, op.job, op.cmd, op.directives)
+        self.assertEqual(op.get_id(), op_copy.get_id())
+        self.assertIs(op.get_id(), op.get_id())
+        self.assertNotEqual(op.get_id(), op.get_id(index=1))
+        self.assertEqual(hash(op), hash(op_copy))
+        self.assertEqual(len({op, op_copy}), 1)
+        with self.assertRaises(AttributeError):
+            op.name = 'other'
+        with self.assertRaises(AttributeError):
+            op.foo = 'bar'
+
     def test_get_job_status(self):
         project = self.mock_project()
         for job in project:
@@ -466,6 +499,121 @@ class ProjectTest(BaseProjectTest):
                 with redirect_stderr():
                     project.print_status(parameters=parameters, detailed=True)
 
+    def test_project_status_varying_parameters(self):
+        project = self.mock_project()
+        for i in range(3):
+            project.open_job(dict(a=i, c=dict(d=[1, 2], e=[i % 2]))).init()
+        output = StringIO()
+        with redirect_stdout():
+            with redirect_stderr():
+                project.print_status(parameters=True, detailed=True, file=output)
+        header = output.getvalue().split('# Detailed View:')[1].splitlines()[1].split()
+        self.assertEqual(header[2:6], ['a', 'b', 'c.d', 'c.e'])
+        jobs = project.find_jobs({'c': {'$exists': True}})
+        self.assertEqual(_varying_keys(job.sp() for job in jobs), ['a', 'c.e'])
+
+    def test_project_status_stream(self):
+        project = self.mock_project()
+        project.STATUS_STREAM_CHUNKSIZE = 2
+        job_ids = [job.get_id() for job in project]
+        output = StringIO()
+        get_job_status = project.get_job_status
+
+        def get_job_status_streamed(job, *args, **kwargs):
+            # The rows of the first chunk are printed before the remaining jobs are evaluated.
+            if job_ids.index(job.get_id()) >= project.STATUS_STREAM_CHUNKSIZE:
+                self.assertIn(job_ids[0], output.getvalue())
+            return get_job_status(job, *args, **kwargs)
+
+        project.get_job_status = get_job_status_streamed
+        with redirect_stdout():
+            project.print_status(
+                detailed=True, stream=True, parameters=['a'], file=output, err=StringIO())
+        output = output.getvalue()
+        self.assertEqual(sorted(job_ids, key=output.index), job_ids)
+        self.assertLess(output.index('# Detailed View:'), output.index('# Overview:'))
+
+        # All rows are printed with a fixed column width.
+        lines = output.splitlines()
+        offset = lines[1].index('labels')
+        for line in lines[3:]:
+            if not line:
+                break
+            self.assertEqual(line[offset - 2:offset], '  ')
+            self.assertNotEqual(line[offset], ' ')
+
+        # All output is written to the given file.
+        output = StringIO()
+        stdout = StringIO()
+        with redirect_stdout(stdout):
+            project.print_status(detailed=True, stream=True, file=output, err=StringIO(),
+                                 parameters=project.PRINT_STATUS_ALL_VARYING_PARAMETERS)
+        self.assertEqual(stdout.getvalue(), '')
+        self.assertIn('[Q]:queued', output.getvalue())
+
+    def test_status_cache(self):
+        # Jobs are only cached when they have not been modified very recently.
+        racy_window = status_cache.RACY_WINDOW
+        status_cache.RACY_WINDOW = 0
+        self.addCleanup(setattr, status_cache, 'RACY_WINDOW', racy_window)
+
+        evaluated = []
+
+        class Project(FlowProject):
+            pass
+
+        @Project.label
+        def ready(job):
+            evaluated.append(job.get_id())
+            return job.doc.get('ready', False)
+
+        @Project.operation
+        @Project.post.true('ready')
+        def make_ready(job):
+            job.doc.ready = True
+
+        project = Project(self.mock_project().config)
+        project._use_status_cache = True
+
+        def fetch_status():
+            del evaluated[:]
+            return project._fetch_status(
+                project, StringIO(), ignore_errors=False, no_parallelize=False)
+
+        status = fetch_status()
+        self.assertEqual(len(evaluated), len(project))
+        self.assertEqual(fetch_status(), status)
+        self.assertEqual(len(evaluated), 0)
+
+        job = next(iter(project))
+        job.doc.ready = True
+        status = {s['job_id']: s for s in fetch_status()}
+        self.assertEqual(evaluated, [job.get_id()])
+        self.assertEqual(status[job.get_id()]['labels'], ['ready'])
+        self.assertTrue(status[job.get_id()]['operations']['make_ready']['completed'])
+
+        project._use_status_cache = False
+        self.assertEqual({s['job_id']: s for s in fetch_status()}, status)
+        self.assertEqual(len(evaluated), len(project))
+
+    def test_status_parallel_backends(self):
+        project = self.mock_project()
+        statuses = {
+            backend: project._fetch_status(
+                project, StringIO(), ignore_errors=False, no_parallelize=False,
+                parallel_backend=backend)
+            for backend in ('process', 'thread', 'serial')}
+        self.assertEqual([s['job_id'] for s in statuses['process']],
+                         [job.get_id() for job in project])
+        self.assertEqual(statuses['process'], statuses['serial'])
+        self.assertEqual(statuses['thread'], statuses['serial'])
+        with self.assertRaises(ValueError):
+            project._fetch_status(project, StringIO(), ignore_errors=False,
+                                  no_parallelize=False, parallel_backend='invalid')
+        with redirect_stdout():
+            with redirect_stderr():
+                project.print_status(parallel_backend='process', detailed=True)
+
     def test_script(self):
         project = self.mock_project()
         for job in project:
@@ -500,6 +648,24 @@ class ProjectTest(BaseProjectTest):
                 self.assertNotIn('echo "hello"', script)
                 self.assertIn('exec op2', script)
 
+    def test_template_cache(self):
+        project = self.mock_project()
+        ops = [op for job in project for op in project.next_operations(job)]
+        script = project.script(ops)
+        self.assertTrue(os.listdir(project._fn_template_cache()))
+        env = project._template_environment()
+        self.assertIs(env.get_template('script.sh'), env.get_template('script.sh'))
+
+        # A new instance loads the compiled templates from the cache.
+        project = type(project)(project.config)
+        self.assertEqual(project.script(ops), script)
+
+        shutil.rmtree(project._fn_template_cache())
+        project.config.setdefault('flow', dict())['template_cache'] = False
+        project = type(project)(project.config)
+        self.assertEqual(project.script(ops), script)
+        self.assertFalse(os.path.exists(project._fn_template_cache()))
+
     def test_init(self):
         with open(os.devnull, 'w') as out:
             for fn in init(root=self._tmp_dir.name, out=out):
@@ -581,6 +747,210 @@ class ExecutionProjectTest(BaseProjectTest):
             else:
                 self.assertFalse(job.isfile('world.txt'))
 
+    def test_run_parallel_worker(self):
+        from flow.project import _init_worker_with_serialization, _fork_in_worker
+        project = self.mock_project()
+        ops = [op for job in project for op in project.next_operations(job) if op.name == 'op2']
+        project._call_with_serialization(
+            lambda pickle: _init_worker_with_serialization(pickle.loads, pickle.dumps(project)))
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                for op in ops:
+                    _fork_in_worker(project._dumps_op(op))
+        self.assertTrue(all(job.doc.get('test') for job in project))
+
+        # Many short operations are dispatched in chunks.
+        project = self.mock_project()
+        for job in project:
+            del job.doc['test']
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                with redirect_stderr(StringIO()):
+                    project.run(names=['op2'], np=2, progress=True)
+        self.assertTrue(all(job.doc.get('test') for job in project))
+
+    def test_run_dataflow(self):
+        project = self.mock_project()
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                with redirect_stderr(StringIO()):
+                    project.run(dataflow=True, progress=True)
+        even_jobs = [job for job in project if job.sp.b % 2 == 0]
+        for job in project:
+            self.assertEqual(job.isfile('world.txt'), job in even_jobs)
+            self.assertTrue(job.doc.get('test'))
+
+        for job in project:
+            job.remove()
+        project = self.mock_project()
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                with redirect_stderr(StringIO()):
+                    project.run(names=['op1', 'op2'], dataflow=True, np=2)
+        self.assertTrue(all(job.doc.get('test') for job in project))
+
+    def test_run_packed(self):
+        project = self.mock_project()
+        operations = [op for job in project for op in project.next_operations(job)]
+        for i, op in enumerate(operations):
+            op.directives['np'] = i % 3
+        operations[0].directives['ngpu'] = 2     # exceeds the available GPUs
+        operations[1].directives['memory'] = 1e9     # exceeds the available memory
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                with redirect_stderr(StringIO()):
+                    project.run_operations(operations, np=2, pack=True, ngpu=1, progress=True)
+        even_jobs = [job for job in project if job.sp.b % 2 == 0]
+        for job in project:
+            self.assertEqual(job.isfile('world.txt'), job in even_jobs)
+            self.assertTrue(job.doc.get('test'))
+        with self.assertRaises(ValueError):
+            project.run(dataflow=True, pack=True)
+
+    def test_run_packed_resources(self):
+        project = self.mock_project()
+        job = next(iter(project))
+        fn_log = os.path.join(self._tmp_dir.name, 'intervals.txt')
+        fn_script = os.path.join(self._tmp_dir.name, 'interval.py')
+        with open(fn_script, 'w') as file:
+            file.write('\n'.join([
+                "import sys, time",
+                "start = time.time()",
+                "time.sleep(0.2)",
+                "with open(sys.argv[1], 'a') as file:",
+                "    file.write('{} {} {}\\n'.format(sys.argv[2], start, time.time()))",
+            ]))
+        requests = dict(
+            ['small{}'.format(i), dict(np=1, memory=1)] for i in range(6))
+        requests.update(['gpu{}'.format(i), dict(np=2, ngpu=1, memory=2)] for i in range(2))
+        requests['many_processors'] = dict(np=8)
+        requests['much_memory'] = dict(np=1, memory=16)
+        operations = [JobOperation(name, job, '{} {} {} {}'.format(
+            sys.executable, fn_script, fn_log, name), directives) for name, directives in
+            sorted(requests.items())]
+        with redirect_stderr(StringIO()):
+            project.run_operations(operations, np=4, pack=True, ngpu=2, memory=4)
+
+        intervals = dict()
+        with open(fn_log) as file:
+            for line in file:
+                name, start, end = line.split()
+                intervals[name] = float(start), float(end)
+        self.assertEqual(set(intervals), set(requests))
+
+        def overlapping(name):
+            start, end = intervals[name]
+            return [other for other, (start_, end_) in intervals.items()
+                    if start_ < end and start < end_]
+
+        # Operations that exceed the available resources are executed alone.
+        oversized = ('many_processors', 'much_memory')
+        for name in oversized:
+            self.assertEqual(overlapping(name), [name])
+        # Otherwise, the requested resources of concurrently executed operations
+        # never exceed the available resources.
+        peak = dict(np=0, ngpu=0, memory=0)
+        for name in set(intervals).difference(oversized):
+            start = intervals[name][0]
+            running = [other for other in overlapping(name) if intervals[other][0] <= start]
+            for key in peak:
+                peak[key] = max(peak[key], sum(requests[op].get(key, 0) for op in running))
+        self.assertGreater(peak['np'], 1)
+        self.assertLessEqual(peak['np'], 4)
+        self.assertLessEqual(peak['ngpu'], 2)
+        self.assertLessEqual(peak['memory'], 4)
+
+    @unittest.skipIf(sys.version_info < (3, 5), 'Requires Python 3.5 or higher.')
+    def test_run_asynchronous(self):
+        from subprocess import TimeoutExpired
+        # The operations executed with the 'exec' command read the configuration from disk.
+        with open(os.path.join(self._tmp_dir.name, 'signac.rc'), 'a') as file:
+            file.write('[flow]\nrecord_stats = true\n')
+        project = self.mock_project()
+        operations = [op for job in project for op in project.next_operations(job)
+                      if op.name == 'op1']
+        job = operations[0].job
+        # Operations defined as functions are executed by forking as well:
+        operations.extend(op for op in project.next_operations(job) if op.name == 'op2')
+        operations.append(JobOperation('echo', job, 'echo "hello"'))
+        output = StringIO()
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                with redirect_stdout(output):
+                    with redirect_stderr(StringIO()):
+                        project.run_operations(operations, np=4, asynchronous=True,
+                                               progress=True)
+        self.assertIn('hello', output.getvalue())
+        self.assertTrue(job.doc.get('test'))
+        # The usage of all operations but the anonymous one is recorded per process.
+        records = list(load_stats(project._fn_stats()))
+        self.assertEqual(
+            sorted((r.name, r.job_id) for r in records),
+            sorted((op.name, op.job.get_id()) for op in operations[:-1]))
+        for record in records:
+            self.assertGreater(record.maxrss, 0)
+        even_jobs = [job for job in project if job.sp.b % 2 == 0]
+        for job in project:
+            self.assertEqual(job.isfile('world.txt'), job in even_jobs)
+        # Lines that exceed the buffer limit of the output streams are forwarded as well.
+        output = StringIO()
+        long_line = JobOperation(
+            'long', job, '{} -c "print(\'x\' * 100000)"'.format(sys.executable))
+        with redirect_stdout(output):
+            project.run_operations([long_line, JobOperation('echo', job, 'echo "done"')],
+                                   np=2, asynchronous=True)
+        self.assertIn('x' * 100000 + '\n', output.getvalue())
+        self.assertIn('done\n', output.getvalue())
+        with self.assertRaises(TimeoutExpired):
+            project.run_operations([JobOperation('sleep', job, 'sleep 10')],
+                                   asynchronous=True, timeout=0.1)
+        with self.assertRaises(ValueError):
+            project.run_operations(operations, asynchronous=True, pack=True)
+
+    def test_run_stats(self):
+        project = self.mock_project()
+        operations = [op for job in project for op in project.next_operations(job)
+                      if op.name in ('op1', 'op2')]
+        op1 = next(op for op in operations if op.name == 'op1')
+        # The recording is disabled by default:
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                with redirect_stderr(StringIO()):
+                    project.run_operations(operations)
+        self.assertEqual(list(load_stats(project._fn_stats())), [])
+        self.assertEqual(project._recorded_cmd(op1), op1.cmd)
+
+        project.config.setdefault('flow', dict())['record_stats'] = True
+        project = type(project)(project.config)
+        with add_cwd_to_environment_pythonpath():
+            with switch_to_directory(project.root_directory()):
+                with redirect_stderr(StringIO()):
+                    project.run_operations(operations)
+        records = list(load_stats(project._fn_stats()))
+        self.assertEqual(
+            {(r.name, r.job_id) for r in records},
+            {(op.name, op.job.get_id()) for op in operations})
+        for record in records:
+            self.assertGreaterEqual(record.walltime, 0)
+            self.assertGreaterEqual(record.cputime, 0)
+            # The peak RSS is only known for operations executed in processes of their own.
+            if record.name == 'op1':
+                self.assertGreater(record.maxrss, 0)
+            else:
+                self.assertIsNone(record.maxrss)
+        output = StringIO()
+        project.print_stats(names=['op1'], file=output)
+        self.assertIn('op1', output.getvalue())
+        self.assertNotIn('op2', output.getvalue())
+
+        # Shell command operations are submitted with the 'exec' command to record their usage.
+        self.assertIn('exec op1 {}'.format(op1.job.get_id()), project._recorded_cmd(op1))
+        output = StringIO()
+        with redirect_stdout(output):
+            with redirect_stderr(StringIO()):
+                project.submit_operations([op1], pretend=True)
+        self.assertIn(project._recorded_cmd(op1), output.getvalue())
+
     def test_submit_operations(self):
         MockScheduler.reset()
         project = self.mock_project()
@@ -658,6 +1028,33 @@ class ExecutionProjectTest(BaseProjectTest):
             project.submit(bundle_size=0)
             self.assertEqual(len(list(MockScheduler.jobs())), 1)
 
+    def test_packed_bundles(self):
+        project = self.mock_project()
+        job = next(iter(project))
+        requirements = [(3, 1), (2, 1), (2, 1), (1, 1), (4, 2), (1, 2), (5, 1)]
+        ops = [JobOperation('op{}'.format(i), job, 'true', directives=dict(np=np, walltime=wt))
+               for i, (np, wt) in enumerate(requirements)]
+        bundles = list(make_packed_bundles(ops, num_nodes=1, cores_per_node=4))
+        self.assertEqual([[op.name for op in bundle] for bundle in bundles],
+                         [['op4'], ['op5', 'op0'], ['op6'], ['op1', 'op2'], ['op3']])
+
+        MockScheduler.reset()
+        num_ops = len([op for job in project for op in project.next_operations(job)])
+        with redirect_stderr(StringIO()):
+            with self.assertRaises(ValueError):
+                project.submit(bundle_nodes=1)
+            MockEnvironment.cores_per_node = 2
+            try:
+                for bundle_size in (0, 2):
+                    with self.assertRaises(ValueError):
+                        project.submit(bundle_size=bundle_size, bundle_nodes=1)
+                self.assertEqual(len(list(MockScheduler.jobs())), 0)
+                project.submit(bundle_nodes=1)
+            finally:
+                del MockEnvironment.cores_per_node
+        self.assertEqual(len(list(MockScheduler.jobs())), (num_ops + 1) // 2)
+        MockScheduler.reset()
+
     def test_submit_status(self):
         MockScheduler.reset()
         project = self.mock_project()
@@ -696,6 +1093,282 @@ class ExecutionProjectTest(BaseProjectTest):
                     job_status['operations'][op]['scheduler_status'],
                     (JobStatus.unknown, JobStatus.inactive))
 
+    def test_submit_status_buffered(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        writes = []
+        update = project._status_store.update
+
+        def count_writes(statuses):
+            writes.append(statuses)
+            return update(statuses)
+
+        def submit_operations(*args, **kwargs):
+            return JobStatus.submitted
+
+        project._status_store.update = count_writes
+        project.submit_operations = submit_operations
+        with redirect_stderr(StringIO()):
+            project.submit()
+        self.assertEqual(len(writes), 1)
+        for job in project:
+            self.assertEqual(project.next_operation(job).get_status(), JobStatus.submitted)
+
+        # The status is also stored when the submission fails.
+        def submit_operations_with_error(*args, **kwargs):
+            if submit_operations_with_error.count:
+                raise RuntimeError()
+            submit_operations_with_error.count += 1
+            return JobStatus.queued
+        submit_operations_with_error.count = 0
+
+        project.submit_operations = submit_operations_with_error
+        project._status_store.clear()
+        with self.assertRaises(RuntimeError):
+            project.submit()
+        statuses = [project.next_operation(job).get_status() for job in project]
+        self.assertEqual(statuses.count(JobStatus.queued), 1)
+        self.assertEqual(statuses.count(JobStatus.unknown), len(project) - 1)
+
+    def test_submit_concurrently(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        ops = [op for job in project for op in project.next_operations(job)]
+        start = time.time()
+        with redirect_stderr(StringIO()):
+            project.submit(bundle_size=2, num_workers=4, max_submit_rate=50)
+        num_bundles = (len(ops) + 1) // 2
+        self.assertGreaterEqual(time.time() - start, (num_bundles - 1) / 50.0)
+        self.assertEqual(len(list(MockScheduler.jobs())), num_bundles)
+        for op in ops:
+            self.assertEqual(op.get_status(), JobStatus.submitted)
+
+        # The status of all successfully submitted bundles is stored if one submission fails.
+        def submit_operations(operations, **kwargs):
+            if operations[0].job == ops[0].job:
+                raise RuntimeError()
+            return JobStatus.queued
+
+        project.submit_operations = submit_operations
+        project._status_store.clear()
+        with redirect_stderr(StringIO()):
+            with self.assertRaises(RuntimeError):
+                project.submit(num_workers=4)
+        statuses = [op.get_status() for op in ops]
+        num_failed = len(list(project.next_operations(ops[0].job)))
+        self.assertEqual(statuses.count(JobStatus.unknown), num_failed)
+        self.assertEqual(statuses.count(JobStatus.queued), len(ops) - num_failed)
+        MockScheduler.reset()
+
+        # The output of concurrent submissions is printed in the order of the bundles.
+        def submit_operations_slowly(operations, **kwargs):
+            print('begin', operations[0].get_id(), file=sys.stderr)
+            if operations[0].get_id() == ops[0].get_id():
+                time.sleep(0.2)
+            print('end', operations[0].get_id(), file=sys.stderr)
+            return JobStatus.queued
+
+        project.submit_operations = submit_operations_slowly
+        project._status_store.clear()
+        stderr = StringIO()
+        with redirect_stderr(stderr):
+            project.submit(num_workers=4)
+        lines = [line.split() for line in stderr.getvalue().splitlines()]
+        self.assertEqual(len(lines), 2 * len(ops))
+        self.assertEqual(lines[0], ['begin', ops[0].get_id()])
+        for begin, end in zip(lines[::2], lines[1::2]):
+            self.assertEqual((begin[0], end[0]), ('begin', 'end'))
+            self.assertEqual(begin[1], end[1])
+
+    def test_status_store(self):
+        project = self.mock_project()
+        ops = [project.next_operation(job) for job in project]
+        project.document['_status'] = {ops[0].get_id(): int(JobStatus.queued)}
+
+        # Legacy status information is migrated to the sharded store.
+        project = type(project)(project.config)
+        self.assertEqual(project.next_operation(ops[0].job).get_status(), JobStatus.queued)
+        self.assertNotIn('_status', project.document)
+        self.assertTrue(os.path.isdir(project._fn_status_store()))
+        project._set_operation_status_many({op.get_id(): JobStatus.held for op in ops[1:]})
+        for op in ops[1:]:
+            self.assertEqual(project._get_operation_status(op.get_id()), JobStatus.held)
+
+        project.config.setdefault('flow', dict())['status_store'] = 'document'
+        project = type(project)(project.config)
+        op = project.next_operation(project.open_job(id=ops[0].job.get_id()))
+        self.assertEqual(op.get_status(), JobStatus.unknown)
+        op.set_status(JobStatus.active)
+        self.assertEqual(project.document['_status'][ops[0].get_id()], int(JobStatus.active))
+
+        project.config['flow']['status_store'] = 'invalid'
+        with self.assertRaises(ValueError):
+            type(project)(project.config)
+
+    def test_scheduler_snapshot(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        project.config.setdefault('flow', dict())['scheduler_snapshot_ttl'] = 60
+        project = type(project)(project.config)
+        queries = []
+        jobs = MockScheduler.__dict__['jobs']
+
+        def count_queries():
+            queries.append(None)
+            return MockScheduler._jobs.values()
+
+        MockScheduler.jobs = staticmethod(count_queries)
+        try:
+            with redirect_stderr(StringIO()):
+                project._fetch_scheduler_status()
+                project.submit(num=1)
+                project._fetch_scheduler_status()
+            self.assertEqual(len(queries), 1)
+            ops = [op for job in project for op in project.next_operations(job)]
+            submitted = [op for op in ops if op.get_status() == JobStatus.submitted]
+            self.assertEqual(len(submitted), 1)
+
+            # The snapshot taken for the project's cluster jobs is valid for all cluster jobs.
+            other_id = uuid.uuid4()
+            MockScheduler._jobs[other_id] = ClusterJob('OtherProject/abc', JobStatus.queued)
+            scheduler = project._environment.get_scheduler()
+            project._scheduler_snapshot.clear()
+            self.assertEqual(len(list(project._project_scheduler_jobs(scheduler))), 1)
+            self.assertEqual(len(list(project.scheduler_jobs(scheduler))), 2)
+            self.assertEqual(len(queries), 2)
+            del MockScheduler._jobs[other_id]
+
+            # The snapshot is shared across instances when persistent.
+            project.config['flow']['scheduler_snapshot_persistent'] = True
+            project = type(project)(project.config)
+            with redirect_stderr(StringIO()):
+                project._fetch_scheduler_status()
+                type(project)(project.config)._fetch_scheduler_status()
+            self.assertEqual(len(queries), 3)
+            self.assertTrue(os.path.isfile(project._fn_scheduler_snapshot()))
+
+            project._scheduler_snapshot.clear()
+            with redirect_stderr(StringIO()):
+                project._fetch_scheduler_status()
+            self.assertEqual(len(queries), 4)
+        finally:
+            MockScheduler.jobs = jobs
+            MockScheduler.reset()
+
+    def test_project_scheduler_jobs(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        MockScheduler._jobs[uuid.uuid4()] = ClusterJob('OtherProject/bundle/abc', JobStatus.queued)
+        with redirect_stderr(StringIO()):
+            project.submit(num=4)
+        scheduler = project._environment.get_scheduler()
+        self.assertEqual(len(list(project.scheduler_jobs(scheduler))), 5)
+        project_jobs = list(project._project_scheduler_jobs(scheduler))
+        self.assertEqual(len(project_jobs), 4)
+        with redirect_stderr(StringIO()):
+            project._fetch_scheduler_status()
+        for sjob in project_jobs:
+            self.assertEqual(project._get_operation_status(sjob.name()), JobStatus.submitted)
+        MockScheduler.reset()
+
+    def test_bundle_index(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        ops = [op for job in project for op in project.next_operations(job)]
+        bundle_id = '{}/bundle/a'.format(project)
+        project._add_bundle_to_index(bundle_id, ops[:2])
+        legacy_bundle_id = '{}/bundle/b'.format(project)
+        os.makedirs(os.path.dirname(project._fn_bundle(legacy_bundle_id)))
+        with open(project._fn_bundle(legacy_bundle_id), 'w') as file:
+            file.write(ops[2].get_id() + '\n')
+        MockScheduler._jobs[uuid.uuid4()] = ClusterJob(bundle_id, JobStatus.queued)
+        MockScheduler._jobs[uuid.uuid4()] = ClusterJob(legacy_bundle_id, JobStatus.held)
+        with redirect_stderr(StringIO()):
+            project._fetch_scheduler_status()
+        self.assertEqual([op.get_status() for op in ops[:4]],
+                         [JobStatus.queued, JobStatus.queued, JobStatus.held, JobStatus.unknown])
+
+        # Bundles are only removed once their cluster jobs are gone and the minimal age is reached.
+        MockScheduler.reset()
+        with redirect_stderr(StringIO()):
+            project._fetch_scheduler_status()
+        self.assertIn(bundle_id, project._load_bundle_index())
+        project.BUNDLE_GC_MIN_AGE = 0
+        with redirect_stderr(StringIO()):
+            project._fetch_scheduler_status()
+        self.assertEqual(project._load_bundle_index(), dict())
+        self.assertFalse(os.path.exists(project._fn_bundle(legacy_bundle_id)))
+
+        # Unknown bundles are skipped.
+        MockScheduler._jobs[uuid.uuid4()] = ClusterJob(legacy_bundle_id, JobStatus.held)
+        stderr = StringIO()
+        with redirect_stderr(stderr):
+            project._fetch_scheduler_status()
+        self.assertIn("Unknown bundle '{}'".format(legacy_bundle_id), stderr.getvalue())
+        self.assertEqual(ops[2].get_status(), JobStatus.unknown)
+        MockScheduler.reset()
+
+    def test_bundle_index_concurrent_gc(self):
+        project = self.mock_project()
+        ops = [op for job in project for op in project.next_operations(job)]
+        stale_bundle_id = '{}/bundle/a'.format(project)
+        new_bundle_id = '{}/bundle/b'.format(project)
+        project._add_bundle_to_index(stale_bundle_id, ops[:2])
+        project.BUNDLE_GC_MIN_AGE = 0
+        load_bundle_index = project._load_bundle_index
+
+        def load_and_add_bundle():
+            # Simulates a bundle that is added concurrently right after the index is loaded.
+            index = load_bundle_index()
+            if new_bundle_id not in index:
+                project._add_bundle_to_index(new_bundle_id, ops[2:4])
+            return index
+
+        project._load_bundle_index = load_and_add_bundle
+        project._gc_bundles(active=set())
+        del project._load_bundle_index
+        self.assertEqual(list(project._load_bundle_index()), [new_bundle_id])
+
+    def test_submit_job_array(self):
+        MockScheduler.reset()
+        project = self.mock_project()
+        ops = list(project._get_pending_operations(project))
+        names = OrderedDict((op.name, None) for op in ops)
+        with self.assertRaises(SubmitError):
+            with redirect_stderr(StringIO()):
+                project.submit(job_array=True)
+        self.assertEqual(len(list(MockScheduler.jobs())), 0)
+        with self.assertRaises(ValueError):
+            project.submit(job_array=True, bundle_size=2)
+
+        MockScheduler.array_task_id_var = 'MOCK_ARRAY_TASK_ID'
+        MockScheduler.array_task_id_offset = 1
+        try:
+            with redirect_stderr(StringIO()):
+                project.submit(job_array=True)
+            cluster_jobs = list(MockScheduler.jobs())
+            self.assertEqual(len(cluster_jobs), len(names))
+            for op in ops:
+                self.assertEqual(op.get_status(), JobStatus.submitted)
+            for script in (MockScheduler._scripts[cid] for cid in MockScheduler._jobs):
+                self.assertIn('case $MOCK_ARRAY_TASK_ID in', script)
+                self.assertIn('\n1)\n', script)
+
+            # The status of individual array tasks is mapped to the corresponding operations.
+            array_id = cluster_jobs[0].name()
+            array_ops = [op for op in ops if op.name == list(names)[0]]
+            MockScheduler._jobs[uuid.uuid4()] = ClusterJob(array_id + '[2]', JobStatus.active)
+            project._scheduler_snapshot.clear()
+            with redirect_stderr(StringIO()):
+                project._fetch_scheduler_status()
+            self.assertEqual([op.get_status() for op in array_ops][:3],
+                             [JobStatus.submitted, JobStatus.active, JobStatus.submitted])
+            self.assertIn(array_id, project._load_bundle_index())
+        finally:
+            del MockScheduler.array_task_id_var
+            del MockScheduler.array_task_id_offset
+            MockScheduler.reset()
+
     @unittest.skipIf(six.PY2, 'logger output not caught for Python 2.7')
     def test_submit_operations_bad_directive(self):
         MockScheduler.reset()
@@ -764,6 +1437,270 @@ class ExecutionProjectTest(BaseProjectTest):
                 project.run()
                 self.assertEqual(nonlocal_['evaluated'], expected_evaluation)
 
+    def test_batch_condition_evaluation(self):
+        project = self.mock_project()
+        calls = []
+
+        def is_even(jobs):
+            calls.append(len(jobs))
+            return [job.sp.b % 2 == 0 for job in jobs]
+
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        @Project.pre.batch(is_even)
+        @Project.post.true('op1')
+        def op1(job):
+            job.doc.op1 = True
+
+        @Project.operation
+        @Project.pre.after(op1)
+        @Project.post.true('op2')
+        def op2(job):
+            job.doc.op2 = True
+
+        project = Project(project.config)
+        jobs = list(project)
+        even_jobs = [job for job in jobs if job.sp.b % 2 == 0]
+        self.assertTrue(len(even_jobs))
+        self.assertEqual(
+            [(op.name, op.job) for op in project._get_pending_operations(jobs)],
+            [('op1', job) for job in even_jobs])
+        self.assertEqual(calls, [len(jobs)])
+
+        # Batch conditions are also correctly evaluated for individual jobs.
+        del calls[:]
+        self.assertTrue(project.operations['op1'].eligible(even_jobs[0]))
+        self.assertEqual(calls, [1])
+
+        del calls[:]
+        with redirect_stderr(StringIO()):
+            project.run()
+        self.assertEqual(calls, [len(jobs)] * 3)
+        for job in jobs:
+            self.assertEqual(job.doc.get('op2', False), job in even_jobs)
+
+    def test_condition_memoization(self):
+        project = self.mock_project()
+        evaluated = []
+
+        def op1_done(job):
+            evaluated.append(job.get_id())
+            return job.doc.get('op1', False)
+
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        @Project.post(op1_done)
+        def op1(job):
+            job.doc.op1 = True
+
+        @Project.operation
+        @Project.pre.after(op1)
+        @Project.post.true('op2')
+        def op2(job):
+            job.doc.op2 = True
+
+        @Project.operation
+        @Project.pre.after(op1)
+        @Project.post.true('op3')
+        def op3(job):
+            job.doc.op3 = True
+
+        project = Project(project.config)
+        jobs = list(project)
+        self.assertEqual(len(project._get_pending_operations(jobs)), len(jobs))
+        self.assertEqual(sorted(evaluated), sorted(job.get_id() for job in jobs))
+        self.assertGreater(project._condition_cache_info['hits'], 0)
+        self.assertIsNone(project._condition_cache)
+
+        # The cache is cleared at the start of each pass.
+        del evaluated[:]
+        with redirect_stderr(StringIO()):
+            project.run()
+        self.assertEqual(len(evaluated), 3 * len(jobs))
+        for job in jobs:
+            self.assertTrue(job.doc.op2 and job.doc.op3)
+
+        del evaluated[:]
+        MockScheduler.reset()
+        status = project._fetch_status(
+            jobs, StringIO(), ignore_errors=False, no_parallelize=True)
+        self.assertEqual(len(evaluated), len(jobs))
+        for s in status:
+            self.assertEqual([op['completed'] for op in s['operations'].values()], [True] * 3)
+
+    def test_next_operations_consumed_lazily(self):
+        project = self.mock_project()
+
+        def op1_done(job):
+            return job.doc.get('op1', False)
+
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        @Project.post(op1_done)
+        def op1(job):
+            job.doc.op1 = True
+
+        @Project.operation
+        @Project.pre(op1_done)
+        @Project.post.true('op2')
+        def op2(job):
+            job.doc.op2 = True
+
+        @Project.operation
+        @Project.pre.after(op2)
+        @Project.post.true('op3')
+        def op3(job):
+            job.doc.op3 = True
+
+        project = Project(project.config)
+        job = next(iter(project))
+        # Operations executed while the generator is consumed affect the
+        # conditions of the operations that are determined afterwards.
+        executed = []
+        for op in project.next_operations(job):
+            project._fork(op)
+            executed.append(op.name)
+        self.assertEqual(executed, ['op1', 'op2', 'op3'])
+        self.assertEqual(list(project.completed_operations(job)), ['op1', 'op2', 'op3'])
+
+    def test_dependency_graph_evaluation(self):
+        project = self.mock_project()
+        evaluated = []
+
+        def ready(job):
+            evaluated.append(job.get_id())
+            return True
+
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        @Project.post.true('op1')
+        def op1(job):
+            job.doc.op1 = True
+
+        @Project.operation
+        @Project.pre(ready)
+        @Project.pre.after(op1)
+        @Project.post.true('op2')
+        def op2(job):
+            job.doc.op2 = True
+
+        @Project.operation
+        @Project.pre.after(op2)
+        @Project.post.true('op3')
+        def op3(job):
+            job.doc.op3 = True
+
+        project = Project(project.config)
+        self.assertEqual(project._operation_graph, {'op2': ['op1'], 'op3': ['op2']})
+        self.assertEqual(project._operations_in_dependency_order(), ['op1', 'op2', 'op3'])
+
+        # The conditions of op2 are not evaluated as long as op1 is incomplete.
+        jobs = list(project)
+        self.assertEqual([op.name for op in project.next_operations(*jobs)], ['op1'] * len(jobs))
+        self.assertEqual(evaluated, [])
+        MockScheduler.reset()
+        for s in project._fetch_status(jobs, StringIO(), False, True):
+            self.assertEqual([op['eligible'] for op in s['operations'].values()],
+                             [True, False, False])
+        self.assertEqual(evaluated, [])
+
+        job = jobs[0]
+        job.doc.op1 = True
+        self.assertEqual([op.name for op in project.next_operations(job)], ['op2'])
+        self.assertEqual(evaluated, [job.get_id()])
+        with redirect_stderr(StringIO()):
+            project.run()
+        for job in jobs:
+            self.assertTrue(job.doc.op3)
+
+    def test_dependency_graph_without_post_conditions(self):
+        project = self.mock_project()
+
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        def op1(job):
+            pass
+
+        @Project.operation
+        @Project.pre.after(op1)
+        def op2(job):
+            pass
+
+        project = Project(project.config)
+        self.assertEqual(project._operation_graph, {'op2': ['op1']})
+        # An operation without post-conditions is never complete, but the
+        # pre.after() condition of its downstream operations is met.
+        for job in project:
+            self.assertEqual([op.name for op in project.next_operations(job)], ['op1', 'op2'])
+        MockScheduler.reset()
+        for s in project._fetch_status(list(project), StringIO(), False, True):
+            self.assertEqual([op['eligible'] for op in s['operations'].values()],
+                             [True, True])
+
+    def test_dependency_graph_order(self):
+        project = self.mock_project()
+
+        class Project(FlowProject):
+            pass
+
+        def op1(job):
+            pass
+
+        @Project.operation
+        @Project.pre.after(op1)
+        def op2(job):
+            pass
+
+        @Project.operation
+        def op3(job):
+            pass
+
+        Project.operation(op1)
+        project = Project(project.config)
+        self.assertEqual(list(project.operations), ['op2', 'op3', 'op1'])
+        # Eligible operations are yielded in dependency order.
+        for job in project:
+            self.assertEqual([op.name for op in project.next_operations(job)],
+                             ['op3', 'op1', 'op2'])
+
+    def test_dependency_graph_condition_calls(self):
+        project = self.mock_project()
+        calls = []
+
+        def op1_done(job):
+            calls.append(job.get_id())
+            return False
+
+        class Project(FlowProject):
+            pass
+
+        @Project.operation
+        @Project.post(op1_done)
+        def op1(job):
+            pass
+
+        @Project.operation
+        @Project.pre.after(op1)
+        def op2(job):
+            pass
+
+        project = Project(project.config)
+        job = next(iter(project))
+        self.assertEqual([op.name for op in project.next_operations(job)], ['op1'])
+        # The post-condition of op1 is evaluated once for the eligibility of op1
+        # and once for the pre.after() condition of op2.
+        self.assertEqual(len(calls), 2)
+
 
 class BufferedExecutionProjectTest(ExecutionProjectTest):
 
@@ -818,6 +1755,21 @@ class ProjectMainInterfaceTest(BaseProjectTest):
         # This unit test mainly checks if the test setup works properly.
         self.call_subcmd('--help')
 
+    def test_main_environment_detection(self):
+        # The environment is only detected when the submit command is used.
+        fn_script = inspect.getsourcefile(type(self.project))
+        msg = 'Using environment configuration'
+        with add_path_to_environment_pythonpath(os.path.abspath(self.cwd)):
+            with switch_to_directory(self.project.root_directory()):
+                for subcmd, detected in (('run -o submit', False),
+                                         ('-v submit --help', True)):
+                    process = subprocess.Popen(
+                        ['python', fn_script] + subcmd.split(),
+                        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                    stdout, stderr = process.communicate()
+                    self.assertEqual(process.returncode, 0)
+                    self.assertEqual(msg in stderr.decode('utf-8'), detected)
+
     def test_main_exec(self):
         self.assertTrue(len(self.project))
         for job in self.project:
@@ -826,6 +1778,37 @@ class ProjectMainInterfaceTest(BaseProjectTest):
         for job in self.project:
             self.assertTrue(job.doc.get('test', False))
 
+    @unittest.skipIf(six.PY2, 'Only check performance on Python 3')
+    def test_import_flow_lazy(self):
+        '''Ensure that importing flow does not import the template engine or scheduler drivers.'''
+        modules = ['jinja2', 'xml.etree.ElementTree', 'flow.util.tabulate', 'flow.util.tqdm']
+        if sys.version_info >= (3, 7):
+            modules.extend('flow.scheduling.' + name for name in (
+                'fakescheduler', 'lsf', 'simple_scheduler', 'slurm', 'torque'))
+        code = "import sys, flow; print(*[m for m in {!r} if m in sys.modules])".format(modules)
+        output = subprocess.check_output([sys.executable, '-c', code])
+        self.assertEqual(output.decode('utf-8').split(), [])
+
+    def test_main_exec_startup(self):
+        '''Ensure that exec does not import modules that are only needed by other commands.'''
+        fn_script = inspect.getsourcefile(type(self.project))
+        modules = ['jinja2', 'flow.util.tabulate', 'flow.util.tqdm', 'xml.etree.ElementTree']
+        if sys.version_info >= (3, 7):
+            modules.extend(['flow.scheduling.slurm', 'flow.scheduling.torque'])
+        code = '\n'.join([
+            "import sys, runpy",
+            "sys.argv = [{fn!r}, 'exec', 'op2']",
+            "runpy.run_path({fn!r}, run_name='__main__')",
+            "print(*[m for m in {modules!r} if m in sys.modules])",
+        ]).format(fn=fn_script, modules=modules)
+        with add_path_to_environment_pythonpath(os.path.abspath(self.cwd)):
+            with switch_to_directory(self.project.root_directory()):
+                output = subprocess.check_output(
+                    [sys.executable, '-c', code], stderr=subprocess.DEVNULL)
+        self.assertEqual(output.decode('utf-8').splitlines()[-1].split(), [])
+        for job in self.project:
+            self.assertTrue(job.doc.get('test', False))
+
     def test_main_run(self):
         self.assertTrue(len(self.project))
         for job in self.project:
@@ -838,6 +1821,21 @@ class ProjectMainInterfaceTest(BaseProjectTest):
             else:
                 self.assertFalse(job.isfile('world.txt'))
 
+    def test_main_stats(self):
+        with open(os.path.join(self.project.root_directory(), 'signac.rc'), 'a') as file:
+            file.write('[flow]\nrecord_stats = true\n')
+        self.assertIn('No operation stats', self.call_subcmd('stats').decode('utf-8'))
+        self.call_subcmd('exec op2')
+        job = next(iter(self.project))
+        output = self.call_subcmd('stats -o op2 -j {}'.format(job.get_id())).decode('utf-8')
+        lines = [line.split() for line in output.splitlines()]
+        self.assertEqual(lines[-1][:2], ['op2', '1'])
+        self.assertIsNone(next(load_stats(self.project._fn_stats())).maxrss)
+        self.call_subcmd('exec op2 {}'.format(job.get_id()))
+        record = list(load_stats(self.project._fn_stats()))[-1]
+        self.assertEqual((record.name, record.job_id), ('op2', job.get_id()))
+        self.assertGreater(record.maxrss, 0)
+
     def test_main_next(self):
         self.assertTrue(len(self.project))
         jobids = set(self.call_subcmd('next op1').decode().split())